@@ -4,15 +4,20 @@ ELM abstract class for API calls
 """
 from abc import ABC
 import os
+import json
 import numpy as np
 import asyncio
 import aiohttp
 import openai
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import tiktoken
-import time
 import logging
 
+from elm.utilities.cache import LLMResponseCache
+from elm.utilities.throttle import AdaptiveTokenBucket
+
 
 logger = logging.getLogger(__name__)
 
@@ -53,6 +58,11 @@ class ApiBase(ABC):
                          }
     """Optional mappings for unusual Azure names to tiktoken/openai names."""
 
+    PROMPT_VERSION = 'v1'
+    """Version tag included in LLM response cache keys. Bump this to
+    invalidate previously cached responses (e.g. when the way responses
+    are used changes)."""
+
     TOKENIZER_PATTERNS = ('gpt-4o', 'gpt-4-32k', 'gpt-4')
     """Order-prioritized list of model sub-strings to look for in model name
     to send to tokenizer. As an alternative to alias lookup, this will use the
@@ -65,9 +75,17 @@ class ApiBase(ABC):
         model : None | str
             Optional specification of OpenAI model to use. Default is
             cls.DEFAULT_MODEL
+
+        Notes
+        -----
+        Set the `response_cache` attribute to an
+        :class:`~elm.utilities.cache.LLMResponseCache` instance to re-use
+        LLM responses for identical requests across runs.
         """
         self.model = model or self.DEFAULT_MODEL
         self.api_queue = None
+        self.response_cache = None
+        self._session = None
         self.messages = []
         self.clear()
 
@@ -99,6 +117,28 @@ class ApiBase(ABC):
         messages = '\n\n'.join(messages)
         return messages
 
+    @property
+    def session(self):
+        """Persistent HTTP session for synchronous API calls.
+
+        The session keeps a pool of keep-alive connections (so repeated
+        calls re-use the same TLS connection) and retries requests that
+        fail with rate limit or server errors.
+
+        Returns
+        -------
+        requests.Session
+        """
+        if self._session is None:
+            retry = Retry(total=3, backoff_factor=0.5,
+                          status_forcelist=(429, 500, 502, 503, 504),
+                          allowed_methods=None)
+            adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                                  max_retries=retry)
+            self._session = requests.Session()
+            self._session.mount('https://', adapter)
+        return self._session
+
     def clear(self):
         """Clear chat history and reduce messages to just the initial model
         role message."""
@@ -188,10 +228,23 @@ class ApiBase(ABC):
             List of API outputs where each list entry is a GPT answer from the
             corresponding message in the all_request_jsons input.
         """
-        self.api_queue = ApiQueue(url, headers, all_request_jsons,
+        out = [self._get_cached_response(req) for req in all_request_jsons]
+        out = [None if content is None else _content_as_response(content)
+               for content in out]
+        todo = [i for i, response in enumerate(out) if response is None]
+        if len(todo) < len(out):
+            logger.debug('Found {} of {} API responses in the cache'
+                         .format(len(out) - len(todo), len(out)))
+
+        self.api_queue = ApiQueue(url, headers,
+                                  [all_request_jsons[i] for i in todo],
                                   ignore_error=ignore_error,
                                   rate_limit=rate_limit)
-        out = await self.api_queue.run()
+        responses = await self.api_queue.run()
+        for i, response in zip(todo, responses):
+            out[i] = response
+            self._cache_response(all_request_jsons[i],
+                                 _response_content(response))
         return out
 
     def chat(self, query, temperature=0):
@@ -255,8 +308,11 @@ class ApiBase(ABC):
                       temperature=temperature,
                       stream=False)
 
-        response = self._client.chat.completions.create(**kwargs)
-        response = response.choices[0].message.content
+        response = self._get_cached_response(kwargs)
+        if response is None:
+            response = self._client.chat.completions.create(**kwargs)
+            response = response.choices[0].message.content
+            self._cache_response(kwargs, response)
         return response
 
     async def generic_async_query(self, queries, model_role=None,
@@ -270,8 +326,10 @@ class ApiBase(ABC):
 
         Parameters
         ----------
-        query : list
-            Questions to ask ChatGPT (list of strings)
+        queries : list | iterable
+            Questions to ask ChatGPT (list of strings). Can also be a
+            generator of strings, in which case the queries are formatted
+            lazily as the request data is built.
         model_role : str | None
             Role for the model to take, e.g.: "You are a research assistant".
             This defaults to self.MODEL_ROLE
@@ -304,10 +362,10 @@ class ApiBase(ABC):
                    "temperature": temperature}
             all_request_jsons.append(req)
 
-        self.api_queue = ApiQueue(self.URL, self.HEADERS, all_request_jsons,
-                                  ignore_error=ignore_error,
-                                  rate_limit=rate_limit)
-        out = await self.api_queue.run()
+        out = await self.call_api_async(self.URL, self.HEADERS,
+                                        all_request_jsons,
+                                        ignore_error=ignore_error,
+                                        rate_limit=rate_limit)
 
         for i, response in enumerate(out):
             choice = response.get('choices', [{'message': {'content': ''}}])[0]
@@ -320,6 +378,23 @@ class ApiBase(ABC):
 
         return out
 
+    def _get_cached_response(self, request_json):
+        """Get the cached LLM response content for a request (if any)"""
+        if self.response_cache is None:
+            return None
+        return self.response_cache.get(self._cache_key(request_json))
+
+    def _cache_response(self, request_json, content):
+        """Store LLM response content for a request (if caching)"""
+        if self.response_cache is None or not content:
+            return
+        self.response_cache.put(self._cache_key(request_json), content)
+
+    def _cache_key(self, request_json):
+        """Get the response cache key for an API request"""
+        request = json.dumps(request_json, sort_keys=True)
+        return LLMResponseCache.make_key(self.PROMPT_VERSION, request)
+
     @classmethod
     def get_embedding(cls, text):
         """Get the 1D array (list) embedding of a text string.
@@ -387,6 +462,24 @@ class ApiBase(ABC):
         return len(encoding.encode(text))
 
 
+def _response_content(response):
+    """Get the message content from a chat completion API response"""
+    choice = response.get('choices', [{'message': {'content': ''}}])[0]
+    message = choice.get('message', {'content': ''})
+    return message.get('content', '')
+
+
+def _content_as_response(content):
+    """Wrap cached content in a chat completion API response dict"""
+    return {'choices': [{'message': {'content': content}}]}
+
+
+def _is_rate_limit_error(response):
+    """Check if an API error response is a rate limit error"""
+    msg = str(response).lower()
+    return 'rate limit' in msg or 'rate_limit' in msg
+
+
 class ApiQueue:
     """Class to manage the parallel API queue and submission"""
 
@@ -435,8 +528,9 @@ class ApiQueue:
         self.out = None
         self.errors = None
         self.tries = None
+        self.bucket = None
         self._retry = False
-        self._tsub = 0
+        self._token_counts = [None] * len(request_jsons)
         self._reset()
         self.job_names = [f'job_{str(ijob).zfill(4)}'
                           for ijob in range(len(request_jsons))]
@@ -447,8 +541,9 @@ class ApiQueue:
         self.out = [None] * len(self)
         self.errors = [None] * len(self)
         self.tries = np.zeros(len(self), dtype=int)
+        self.bucket = AdaptiveTokenBucket(self.rate_limit / 60,
+                                          self.rate_limit)
         self._retry = False
-        self._tsub = 0
 
     def __len__(self):
         """Number of API calls to submit"""
@@ -459,61 +554,78 @@ class ApiQueue:
         """Get a list of async jobs that are being waited on."""
         return [job for ijob, job in self.api_jobs.items() if self.todo[ijob]]
 
+    def _request_tokens(self, ijob):
+        """Get the (cached) token count for a request"""
+        if self._token_counts[ijob] is None:
+            request = self.request_jsons[ijob]
+            self._token_counts[ijob] = ApiBase.count_tokens(str(request),
+                                                            request['model'])
+        return self._token_counts[ijob]
+
+    def _next_job(self):
+        """Get the index of the next job to submit (None if no jobs left)"""
+        for ijob, itodo in enumerate(self.todo):
+            if itodo and ijob not in self.api_jobs:
+                return ijob
+        return None
+
     def submit_jobs(self):
         """Submit a subset jobs asynchronously and hold jobs in the `api_jobs`
-        attribute. Break when the `rate_limit` is exceeded."""
+        attribute. Break when the `rate_limit` is exceeded.
 
-        token_count = 0
-        t_elap = (time.time() - self._tsub) / 60
-        avail_tokens = self.rate_limit * t_elap
-        avail_tokens = min(self.rate_limit, avail_tokens)
+        Jobs draw their token count from a token bucket that refills at up
+        to `rate_limit` tokens per minute, so jobs are only submitted once
+        there is enough rate limit capacity available for them. The refill
+        rate is reduced after rate limit errors and recovers with every
+        successful response.
+        """
 
         for ijob, itodo in enumerate(self.todo):
-            if (ijob not in self.api_jobs
-                    and itodo
-                    and token_count < avail_tokens):
-                request = self.request_jsons[ijob]
-                model = request['model']
-                tokens = ApiBase.count_tokens(str(request), model)
-
-                if tokens > self.rate_limit:
-                    msg = ('Job index #{} with has {} tokens which '
-                           'is greater than the rate limit of {}!'
-                           .format(ijob, tokens, self.rate_limit))
-                    logger.error(msg)
-                    raise RuntimeError(msg)
-
-                elif tokens < avail_tokens:
-                    token_count += tokens
-                    task = asyncio.create_task(ApiBase.call_api(self.url,
-                                                                self.headers,
-                                                                request),
-                                               name=self.job_names[ijob])
-                    self.api_jobs[ijob] = task
-                    self.tries[ijob] += 1
-                    self._tsub = time.time()
-
-                    logger.debug('Submitted "{}" ({} out of {}). '
-                                 'Token count: {} '
-                                 '(rate limit is {}). '
-                                 'Attempts: {}'
-                                 .format(self.job_names[ijob],
-                                         ijob + 1, len(self), token_count,
-                                         self.rate_limit,
-                                         self.tries[ijob]))
-
-            elif token_count >= avail_tokens:
-                token_count = 0
+            if ijob in self.api_jobs or not itodo:
+                continue
+
+            tokens = self._request_tokens(ijob)
+            if tokens > self.rate_limit:
+                msg = ('Job index #{} with has {} tokens which '
+                       'is greater than the rate limit of {}!'
+                       .format(ijob, tokens, self.rate_limit))
+                logger.error(msg)
+                raise RuntimeError(msg)
+
+            if not self.bucket.try_acquire(tokens):
                 break
 
-    async def collect_jobs(self):
+            request = self.request_jsons[ijob]
+            task = asyncio.create_task(ApiBase.call_api(self.url,
+                                                        self.headers,
+                                                        request),
+                                       name=self.job_names[ijob])
+            self.api_jobs[ijob] = task
+            self.tries[ijob] += 1
+
+            logger.debug('Submitted "{}" ({} out of {}). '
+                         'Token count: {} '
+                         '(rate limit is {}). '
+                         'Attempts: {}'
+                         .format(self.job_names[ijob],
+                                 ijob + 1, len(self), tokens,
+                                 self.rate_limit,
+                                 self.tries[ijob]))
+
+    async def collect_jobs(self, timeout=None):
         """Collect asyncronous API calls and API outputs. Store outputs in the
-        `out` attribute."""
+        `out` attribute.
+
+        Parameters
+        ----------
+        timeout : float | None
+            Optional max number of seconds to wait for a job to complete.
+        """
 
         if not any(self.waiting_on):
             return
 
-        complete, _ = await asyncio.wait(self.waiting_on,
+        complete, _ = await asyncio.wait(self.waiting_on, timeout=timeout,
                                          return_when=asyncio.FIRST_COMPLETED)
 
         for job in complete:
@@ -527,6 +639,8 @@ class ApiQueue:
                        '`ApiQueue.request_jsons[{1}]` for more details). '
                        'Error message: {2}'.format(ijob + 1, ijob, task_out))
                 self.errors[ijob] = 'Error: {}'.format(task_out)
+                if _is_rate_limit_error(task_out):
+                    self.bucket.on_failure()
 
                 if (self.ignore_error is not None
                         and self.ignore_error(str(task_out))):
@@ -543,6 +657,7 @@ class ApiQueue:
             else:
                 self.out[ijob] = task_out
                 self.todo[ijob] = False
+                self.bucket.on_success()
 
         n_complete = len(self) - sum(self.todo)
         logger.debug('Finished {} API calls, {} left'
@@ -566,7 +681,17 @@ class ApiQueue:
             i += 1
             self._retry = False
             self.submit_jobs()
-            await self.collect_jobs()
+
+            wait = None
+            next_job = self._next_job()
+            if next_job is not None:
+                tokens = self._request_tokens(next_job)
+                wait = self.bucket.wait_time(tokens)
+
+            if any(self.waiting_on):
+                await self.collect_jobs(timeout=wait)
+            elif wait:
+                await asyncio.sleep(wait)
 
             if any(self.tries > self.max_retries):
                 msg = (f'Hit {self.max_retries} retries on API queries. '
@@ -575,10 +700,8 @@ class ApiQueue:
                 logger.error(msg)
                 raise RuntimeError(msg)
             elif self._retry:
-                time.sleep(10)
+                await asyncio.sleep(10)
             elif i > 1e4:
                 raise RuntimeError('Hit 1e4 iterations. What are you doing?')
-            elif any(self.todo):
-                time.sleep(5)
 
         return self.out
@@ -3,6 +3,7 @@
 Utility to break text up into overlapping chunks.
 """
 import copy
+import json
 from elm.base import ApiBase
 
 
@@ -15,7 +16,7 @@ class Chunker(ApiBase):
     """
 
     def __init__(self, text, tag=None, tokens_per_chunk=500, overlap=1,
-                 split_on='\n\n'):
+                 split_on='\n\n', chunk_cache=None):
         """
         Parameters
         ----------
@@ -32,6 +33,11 @@ class Chunker(ApiBase):
             Number of paragraphs to overlap between chunks
         split_on : str
             Sub string to split text into paragraphs.
+        chunk_cache : None | elm.utilities.cache.LLMResponseCache
+            Optional persistent cache of chunking results. If provided, the
+            chunks are loaded from the cache when the same text has already
+            been chunked with the same settings, and stored in the cache
+            otherwise.
         """
 
         super().__init__()
@@ -45,7 +51,7 @@ class Chunker(ApiBase):
         self._paragraphs = None
         self._ptokens = None
         self._ctokens = None
-        self._chunks = self.chunk_text()
+        self._chunks = self._cached_chunks(chunk_cache)
 
     def __getitem__(self, i):
         """Get a chunk index
@@ -236,6 +242,23 @@ class Chunker(ApiBase):
 
         return chunks
 
+    def _cached_chunks(self, chunk_cache):
+        """Get text chunks from the cache or chunk the text (and cache the
+        results)"""
+        if chunk_cache is None:
+            return self.chunk_text()
+
+        key = chunk_cache.make_key('chunks', self.model, self.tag,
+                                   self.tokens_per_chunk, self.overlap,
+                                   self._split_on, self.text)
+        chunks = chunk_cache.get(key)
+        if chunks is not None:
+            return json.loads(chunks)
+
+        chunks = self.chunk_text()
+        chunk_cache.put(key, json.dumps(chunks))
+        return chunks
+
     def chunk_text(self):
         """Perform the text chunking operation
 
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """ELM Ordinance county file downloading logic"""
+import hashlib
 import logging
 
 from elm.ords.llm import StructuredLLMCaller
@@ -27,6 +28,7 @@ async def download_county_ordinance(
     num_urls=5,
     file_loader_kwargs=None,
     browser_semaphore=None,
+    llm_semaphore=None,
     **kwargs
 ):
     """Download the ordinance document(s) for a single county.
@@ -55,6 +57,10 @@ async def download_county_ordinance(
         Semaphore instance that can be used to limit the number of
         playwright browsers open concurrently. If ``None``, no limits
         are applied. By default, ``None``.
+    llm_semaphore : :class:`asyncio.Semaphore`, optional
+        Semaphore instance that can be used to limit the number of
+        documents being validated by the LLM concurrently. If ``None``,
+        no limits are applied. By default, ``None``.
     **kwargs
         Keyword-value pairs used to initialize an
         `elm.ords.llm.LLMCaller` instance.
@@ -72,11 +78,16 @@ async def download_county_ordinance(
         browser_semaphore,
         **(file_loader_kwargs or {})
     )
+    docs = _dedupe_docs_by_content(docs)
     docs = await _down_select_docs_correct_location(
-        docs, location=location, **kwargs
+        docs, location=location, llm_semaphore=llm_semaphore, **kwargs
     )
     docs = await _down_select_docs_correct_content(
-        docs, location=location, text_splitter=text_splitter, **kwargs
+        docs,
+        location=location,
+        llm_semaphore=llm_semaphore,
+        text_splitter=text_splitter,
+        **kwargs
     )
     logger.info(
         "Found %d potential ordinance documents for %s",
@@ -94,12 +105,11 @@ async def _docs_from_google_search(
         question.format(location=location.full_name)
         for question in QUESTION_TEMPLATES
     ]
-    file_loader_kwargs.update(
-        {
-            "html_read_kwargs": {"text_splitter": text_splitter},
-            "file_cache_coroutine": TempFileCache.call,
-        }
-    )
+    file_loader_kwargs = {
+        **file_loader_kwargs,
+        "html_read_kwargs": {"text_splitter": text_splitter},
+        "file_cache_coroutine": TempFileCache.call,
+    }
     return await google_results_as_docs(
         queries,
         num_urls=num_urls,
@@ -109,24 +119,54 @@ async def _docs_from_google_search(
     )
 
 
-async def _down_select_docs_correct_location(docs, location, **kwargs):
+def _dedupe_docs_by_content(docs):
+    """Drop documents whose text duplicates an earlier document.
+
+    Search result URLs are already unique, but the same document is
+    often mirrored at several URLs (e.g. a state ordinance PDF hosted by
+    multiple county websites). Each copy would otherwise be validated
+    by the LLM separately.
+    """
+    unique_docs = {}
+    for doc in docs:
+        key = hashlib.blake2b(
+            doc.text.encode("utf-8", errors="ignore"), digest_size=16
+        ).digest()
+        if key in unique_docs:
+            logger.debug(
+                "Skipping document from %s (identical to %s)",
+                doc.metadata.get("source", "Unknown"),
+                unique_docs[key].metadata.get("source", "Unknown"),
+            )
+            continue
+        unique_docs[key] = doc
+    return list(unique_docs.values())
+
+
+async def _down_select_docs_correct_location(
+    docs, location, llm_semaphore, **kwargs
+):
     """Remove all documents not pertaining to the location."""
     llm_caller = StructuredLLMCaller(**kwargs)
     county_validator = CountyValidator(llm_caller)
     return await filter_documents(
         docs,
-        validation_coroutine=county_validator.check,
+        validation_coroutine=_with_semaphore(
+            county_validator.check, llm_semaphore
+        ),
         task_name=location.full_name,
         county=location.name,
         state=location.state,
     )
 
 
-async def _down_select_docs_correct_content(docs, location, **kwargs):
+async def _down_select_docs_correct_content(
+    docs, location, llm_semaphore, **kwargs
+):
     """Remove all documents that don't contain ordinance info."""
     return await filter_documents(
         docs,
-        validation_coroutine=_contains_ords,
+        validation_coroutine=_with_semaphore(_contains_ords, llm_semaphore),
         task_name=location.full_name,
         **kwargs,
     )
@@ -138,6 +178,22 @@ async def _contains_ords(doc, **kwargs):
     return doc.metadata.get("contains_ord_info", False)
 
 
+def _with_semaphore(validation_coroutine, semaphore):
+    """Wrap a validation coroutine so that it runs under a semaphore.
+
+    If `semaphore` is ``None``, the validation coroutine is returned
+    unchanged.
+    """
+    if semaphore is None:
+        return validation_coroutine
+
+    async def _validate(doc, **kwargs):
+        async with semaphore:
+            return await validation_coroutine(doc, **kwargs)
+
+    return _validate
+
+
 def _sort_final_ord_docs(all_ord_docs):
     """Sort the final list of documents by year, type, and text length."""
     if not all_ord_docs:
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 """ELM Ordinance function to apply ordinance extraction on a document """
+import hashlib
 import logging
 from warnings import warn
 
@@ -13,6 +14,11 @@ from elm.ords.extraction.parse import StructuredOrdinanceParser
 
 
 logger = logging.getLogger(__name__)
+MIN_ORDINANCE_TEXT_LENGTH = 200
+"""Minimum number of characters (ignoring leading and trailing
+whitespace) a document must contain to be checked for ordinance info"""
+_DATE_CACHE = {}
+_DATE_CACHE_MAX_SIZE = 1024
 
 
 async def check_for_ordinance_info(doc, text_splitter, **kwargs):
@@ -25,7 +31,9 @@ async def check_for_ordinance_info(doc, text_splitter, **kwargs):
         that if the document's metadata contains the
         ``"contains_ord_info"`` key, it will not be processed. To force
         a document to be processed by this function, remove that key
-        from the documents metadata.
+        from the documents metadata. Documents with fewer than
+        :obj:`MIN_ORDINANCE_TEXT_LENGTH` characters of text are marked
+        as not containing ordinance info without querying the LLM.
     text_splitter : obj
         Instance of an object that implements a `split_text` method.
         The method should take text as input (str) and return a list
@@ -52,17 +60,56 @@ async def check_for_ordinance_info(doc, text_splitter, **kwargs):
     if "contains_ord_info" in doc.metadata:
         return doc
 
+    if len((doc.text or "").strip()) < MIN_ORDINANCE_TEXT_LENGTH:
+        logger.debug(
+            "Document text is too short to contain ordinance info; "
+            "skipping LLM validation"
+        )
+        doc.metadata["contains_ord_info"] = False
+        return doc
+
     llm_caller = StructuredLLMCaller(**kwargs)
     chunks = text_splitter.split_text(doc.text)
     validator = OrdinanceValidator(llm_caller, chunks)
     doc.metadata["contains_ord_info"] = await validator.parse()
     if doc.metadata["contains_ord_info"]:
-        doc.metadata["date"] = await DateExtractor(llm_caller).parse(doc)
+        doc.metadata["date"] = await _extract_date(doc, llm_caller)
         doc.metadata["ordinance_text"] = validator.ordinance_text
 
     return doc
 
 
+async def _extract_date(doc, llm_caller):
+    """Extract document date, re-using results for repeated documents.
+
+    The same ordinance document (e.g. a state-level PDF) is often linked
+    from multiple county pages, so extracted dates are cached by a hash
+    of the document text (and model). Only finished results are cached,
+    so a failed or cancelled extraction is simply run again.
+    """
+    key = _date_cache_key(doc, llm_caller)
+    date = _DATE_CACHE.get(key)
+    if date is not None:
+        logger.debug("Re-using date extracted from identical document")
+        return date
+
+    date = await DateExtractor(llm_caller).parse(doc)
+    if len(_DATE_CACHE) >= _DATE_CACHE_MAX_SIZE:
+        _DATE_CACHE.pop(next(iter(_DATE_CACHE)))
+    _DATE_CACHE[key] = date
+    return date
+
+
+def _date_cache_key(doc, llm_caller):
+    """Hash of document pages and LLM model used as date cache key."""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(str(llm_caller.kwargs.get("model")).encode())
+    for page in doc.raw_pages or []:
+        hasher.update(b"\0")
+        hasher.update((page or "").encode("utf-8", errors="ignore"))
+    return hasher.digest()
+
+
 async def extract_ordinance_text_with_llm(doc, text_splitter, extractor):
     """Extract ordinance text from document using LLM.
 
@@ -40,7 +40,7 @@ def llm_response_starts_with_yes(response):
     bool
         `True` if LLM response begins with "Yes".
     """
-    return response.lower().startswith("yes")
+    return response[:3].lower() == "yes"
 
 
 def llm_response_starts_with_no(response):
@@ -56,7 +56,7 @@ def llm_response_starts_with_no(response):
     bool
         `True` if LLM response begins with "No".
     """
-    return response.lower().startswith("no")
+    return response[:2].lower() == "no"
 
 
 def llm_response_does_not_start_with_no(response):
@@ -72,7 +72,7 @@ def llm_response_does_not_start_with_no(response):
     bool
         `True` if LLM response does not begin with "No".
     """
-    return not llm_response_starts_with_no(response)
+    return response[:2].lower() != "no"
 
 
 def setup_graph_wes_types(**kwargs):
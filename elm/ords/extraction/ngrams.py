@@ -60,6 +60,47 @@ def convert_text_to_sentence_ngrams(text, n):
     return all_ngrams
 
 
+def any_sentence_ngram_contains(text, words, n):
+    """Check wether any sentence ngram contains all of the input words.
+
+    This is equivalent to checking each ngram returned by
+    :func:`convert_text_to_sentence_ngrams`, but the text is scanned
+    only once (tracking where each word was last seen) and the scan
+    stops at the first ngram that contains all of the words.
+
+    Parameters
+    ----------
+    text : str
+        Input text containing one or more sentences.
+    words : iterable of str
+        Words that must all appear in a single ngram. Words should be
+        casefolded, since they are compared against the (casefolded)
+        ngram words.
+    n : int
+        Number of words to include per ngram.
+
+    Returns
+    -------
+    bool
+        ``True`` if at least one sentence ngram contains all of the
+        input words, ``False`` otherwise.
+    """
+    words = set(words)
+    for sentence in sent_tokenize(text):
+        sentence_words = _filtered_words(sentence)
+        if len(sentence_words) < n:
+            continue
+
+        last_seen = dict.fromkeys(words, -n)
+        for ind, word in enumerate(sentence_words):
+            if word not in last_seen:
+                continue
+            last_seen[word] = ind
+            if ind - min(last_seen.values()) < n:
+                return True
+    return False
+
+
 def sentence_ngram_containment(original, test, n):
     """Fraction of sentence ngrams from the test text found in the original.
 
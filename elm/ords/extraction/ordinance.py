@@ -168,6 +168,13 @@ class OrdinanceValidator(ValidationWithMemory):
         bool
             ``True`` if any ordinance text was found in the chunks.
         """
+        # the first chunks are always checked for legal text, so submit
+        # those queries concurrently instead of one at a time
+        num_to_prefetch = min(min_chunks_to_process, len(self.text_chunks))
+        await self.prefetch(
+            range(num_to_prefetch), self.IS_LEGAL_TEXT_PROMPT, key="legal_text"
+        )
+
         for ind, text in enumerate(self.text_chunks):
             self._wind_mention_mem.append(possibly_mentions_wind(text))
             if ind >= min_chunks_to_process:
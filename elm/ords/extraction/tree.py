@@ -54,6 +54,7 @@ class AsyncDecisionTree(DecisionTree):
         """
         self._g = graph
         self._history = []
+        self._txt_fmt = None
         assert isinstance(self.graph, nx.DiGraph)
         assert "chat_llm_caller" in self.graph.graph
 
@@ -122,6 +123,7 @@ class AsyncDecisionTree(DecisionTree):
         """
 
         self._history = []
+        self.invalidate_fmt_cache()
 
         while True:
             try:
@@ -7,6 +7,9 @@ from elm.ords.utilities import llm_response_as_json
 
 logger = logging.getLogger(__name__)
 _JSON_INSTRUCTIONS = "Return your answer in JSON format"
+_JSON_INSTRUCTIONS_CASEFOLD = _JSON_INSTRUCTIONS.casefold()
+_MSG_POOL = []
+_MSG_POOL_MAX_SIZE = 256
 
 
 class BaseLLMCaller:
@@ -79,15 +82,14 @@ class LLMCaller(BaseLLMCaller):
             The LLM response, as a string, or ``None`` if something went
             wrong during the call.
         """
+        messages = _get_messages(sys_msg, content)
         response = await self.llm_service.call(
             usage_tracker=self.usage_tracker,
             usage_sub_label=usage_sub_label,
-            messages=[
-                {"role": "system", "content": sys_msg},
-                {"role": "user", "content": content},
-            ],
+            messages=messages,
             **self.kwargs,
         )
+        _release_messages(messages)
         return response
 
 
@@ -179,21 +181,76 @@ class StructuredLLMCaller(BaseLLMCaller):
         """
         sys_msg = _add_json_instructions_if_needed(sys_msg)
 
+        messages = _get_messages(sys_msg, content)
         response = await self.llm_service.call(
             usage_tracker=self.usage_tracker,
             usage_sub_label=usage_sub_label,
-            messages=[
-                {"role": "system", "content": sys_msg},
-                {"role": "user", "content": content},
-            ],
+            messages=messages,
             **self.kwargs,
         )
+        _release_messages(messages)
         return llm_response_as_json(response) if response else {}
 
+    @staticmethod
+    def build_messages(sys_msg, content):
+        """Build the chat messages for a structured LLM query.
+
+        These are the same messages that :meth:`call` sends to the LLM
+        service, so they can be used to submit the query through a
+        different channel (e.g. the OpenAI Batch API).
+
+        Parameters
+        ----------
+        sys_msg : str
+            The LLM system message. If this text does not contain the
+            instruction text "Return your answer in JSON format", it
+            will be added.
+        content : str
+            LLM call content (typically some text to extract info from).
+
+        Returns
+        -------
+        list of dict
+            System and user message dictionaries.
+        """
+        sys_msg = _add_json_instructions_if_needed(sys_msg)
+        return [
+            {"role": "system", "content": sys_msg},
+            {"role": "user", "content": content},
+        ]
+
+
+def _get_messages(sys_msg, content):
+    """Get a system/user message pair, re-using a pooled list if possible.
+
+    The returned list must only be given back to the pool (via
+    :func:`_release_messages`) once the service call that uses it has
+    completed. Lists from cancelled calls are simply dropped, since the
+    service may still hold a reference to them.
+    """
+    messages = (
+        _MSG_POOL.pop()
+        if _MSG_POOL
+        else [{"role": "system"}, {"role": "user"}]
+    )
+    messages[0]["content"] = sys_msg
+    messages[1]["content"] = content
+    return messages
+
+
+def _release_messages(messages):
+    """Return a system/user message pair to the pool."""
+    messages[0]["content"] = messages[1]["content"] = None
+    if len(_MSG_POOL) < _MSG_POOL_MAX_SIZE:
+        _MSG_POOL.append(messages)
+
 
 def _add_json_instructions_if_needed(system_message):
     """Add JSON instruction to system message if needed."""
-    if _JSON_INSTRUCTIONS.casefold() not in system_message.casefold():
+    if _JSON_INSTRUCTIONS in system_message:
+        return system_message
+
+    if _JSON_INSTRUCTIONS_CASEFOLD not in system_message.casefold():
         logger.debug(
             "JSON instructions not found in system message. Adding..."
         )
@@ -88,6 +88,7 @@ async def process_counties_with_openai(
     text_splitter_chunk_overlap=300,
     num_urls_to_check_per_county=5,
     max_num_concurrent_browsers=10,
+    max_num_concurrent_llm_validations=16,
     file_loader_kwargs=None,
     pytesseract_exe_fp=None,
     td_kwargs=None,
@@ -152,6 +153,12 @@ async def process_counties_with_openai(
         machine with limited processing can lead to increased timeouts
         and therefore decreased quality of Google search results.
         By default, ``10``.
+    max_num_concurrent_llm_validations : int, optional
+        Maximum number of documents (across all counties) that can be
+        validated by the LLM concurrently when down-selecting search
+        results. Limiting this number keeps a burst of candidate
+        documents from exceeding the LLM rate limit all at once. If
+        ``None`` or ``0``, no limits are applied. By default, ``16``.
     pytesseract_exe_fp : path-like, optional
         Path to pytesseract executable. If this option is specified, OCR
         parsing for PDf files will be enabled via pytesseract.
@@ -231,6 +238,9 @@ async def process_counties_with_openai(
             text_splitter_chunk_overlap=text_splitter_chunk_overlap,
             num_urls_to_check_per_county=num_urls_to_check_per_county,
             max_num_concurrent_browsers=max_num_concurrent_browsers,
+            max_num_concurrent_llm_validations=(
+                max_num_concurrent_llm_validations
+            ),
             file_loader_kwargs=file_loader_kwargs,
             pytesseract_exe_fp=pytesseract_exe_fp,
             td_kwargs=td_kwargs,
@@ -260,6 +270,7 @@ async def _process_with_logs(
     text_splitter_chunk_overlap=300,
     num_urls_to_check_per_county=5,
     max_num_concurrent_browsers=10,
+    max_num_concurrent_llm_validations=16,
     file_loader_kwargs=None,
     pytesseract_exe_fp=None,
     td_kwargs=None,
@@ -306,6 +317,11 @@ async def _process_with_logs(
         if max_num_concurrent_browsers
         else None
     )
+    llm_semaphore = (
+        asyncio.Semaphore(max_num_concurrent_llm_validations)
+        if max_num_concurrent_llm_validations
+        else None
+    )
 
     async with RunningAsyncServices(services):
         tasks = []
@@ -326,6 +342,7 @@ async def _process_with_logs(
                     num_urls=num_urls_to_check_per_county,
                     file_loader_kwargs=file_loader_kwargs,
                     browser_semaphore=browser_semaphore,
+                    llm_semaphore=llm_semaphore,
                     level=log_level,
                     llm_service=OpenAIService,
                     usage_tracker=usage_tracker,
@@ -401,6 +418,7 @@ async def process_county_with_logging(
     num_urls=5,
     file_loader_kwargs=None,
     browser_semaphore=None,
+    llm_semaphore=None,
     level="INFO",
     **kwargs,
 ):
@@ -433,6 +451,10 @@ async def process_county_with_logging(
         Semaphore instance that can be used to limit the number of
         playwright browsers open concurrently. If ``None``, no limits
         are applied. By default, ``None``.
+    llm_semaphore : asyncio.Semaphore, optional
+        Semaphore instance that can be used to limit the number of
+        documents being validated by the LLM concurrently. If ``None``,
+        no limits are applied. By default, ``None``.
     level : str, optional
         Log level to set for retrieval logger. By default, ``"INFO"``.
     **kwargs
@@ -456,6 +478,7 @@ async def process_county_with_logging(
                 num_urls=num_urls,
                 file_loader_kwargs=file_loader_kwargs,
                 browser_semaphore=browser_semaphore,
+                llm_semaphore=llm_semaphore,
                 **kwargs,
             ),
             name=county.full_name,
@@ -480,6 +503,7 @@ async def process_county(
     num_urls=5,
     file_loader_kwargs=None,
     browser_semaphore=None,
+    llm_semaphore=None,
     **kwargs,
 ):
     """Download and parse ordinance document for a single county.
@@ -506,6 +530,10 @@ async def process_county(
         Semaphore instance that can be used to limit the number of
         playwright browsers open concurrently. If ``None``, no limits
         are applied. By default, ``None``.
+    llm_semaphore : asyncio.Semaphore, optional
+        Semaphore instance that can be used to limit the number of
+        documents being validated by the LLM concurrently. If ``None``,
+        no limits are applied. By default, ``None``.
     **kwargs
         Keyword-value pairs used to initialize an
         `elm.ords.llm.LLMCaller` instance.
@@ -524,6 +552,7 @@ async def process_county(
         num_urls=num_urls,
         file_loader_kwargs=file_loader_kwargs,
         browser_semaphore=browser_semaphore,
+        llm_semaphore=llm_semaphore,
         **kwargs,
     )
     if doc is None:
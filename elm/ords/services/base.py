@@ -74,19 +74,25 @@ class Service(ABC):
         fut : asyncio.Future
             A future object that should get the result of the processing
             operation. If the processing function returns ``answer``,
-            this method should call ``fut.set_result(answer)``.
+            this method should call ``fut.set_result(answer)``. If the
+            future has been cancelled (i.e. the caller is no longer
+            waiting on the result), the processing call is skipped.
         **kwargs
             Keyword arguments to be passed to the
             underlying processing function.
         """
+        if fut.cancelled():
+            return
 
         try:
             response = await self.process(*args, **kwargs)
         except Exception as e:
-            fut.set_exception(e)
+            if not fut.cancelled():
+                fut.set_exception(e)
             return
 
-        fut.set_result(response)
+        if not fut.cancelled():
+            fut.set_result(response)
 
     def acquire_resources(self):
         """Use this method to allocate resources, if needed"""
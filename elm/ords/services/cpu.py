@@ -82,7 +82,8 @@ def _read_pdf_ocr(pdf_bytes, tesseract_cmd, **kwargs):
     if tesseract_cmd:
         _configure_pytesseract(tesseract_cmd)
 
-    pages = read_pdf_ocr(pdf_bytes, verbose=True)
+    # already running in a process pool, so OCR the pages serially
+    pages = read_pdf_ocr(pdf_bytes, verbose=True, max_workers=1)
     return PDFDocument(pages, **kwargs)
 
 
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 """ELM Ordinances OpenAI service amd utils."""
+import asyncio
+import json
 import logging
 
 import openai
+from openai.types.chat import ChatCompletion
 
 from elm.base import ApiBase
 from elm.ords.services.base import RateLimitedService
@@ -11,6 +14,7 @@ from elm.utilities.retry import async_retry_with_exponential_backoff
 
 
 logger = logging.getLogger(__name__)
+_BATCH_END_STATES = {"completed", "failed", "expired", "cancelled"}
 
 
 def usage_from_response(current_usage, response):
@@ -75,6 +79,132 @@ def count_tokens(messages, model):
     return message_total + 3
 
 
+async def batch_chat_completions(
+    client,
+    requests,
+    *,
+    endpoint="/v1/chat/completions",
+    completion_window="24h",
+    poll_interval=60,
+    max_wait=24 * 60 * 60,
+):
+    """Run chat completion requests through the OpenAI Batch API.
+
+    Batch requests are billed at a reduced rate and do not count
+    against the regular rate limits, at the cost of a much longer
+    turnaround time (up to `completion_window`). This makes them a
+    good fit for large, non-interactive jobs.
+
+    Parameters
+    ----------
+    client : openai.AsyncOpenAI | openai.AsyncAzureOpenAI
+        Async OpenAI client instance. Must have async `files` and
+        `batches` resources.
+    requests : list of dict
+        List of request bodies. Each body should contain the keyword
+        arguments that would otherwise be passed to
+        `client.chat.completions.create` (e.g. "model", "messages",
+        "temperature", etc.).
+    endpoint : str, optional
+        Batch endpoint that the requests should be sent to.
+        By default, ``"/v1/chat/completions"``.
+    completion_window : str, optional
+        Time frame within which the batch should be processed.
+        By default, ``"24h"``.
+    poll_interval : int | float, optional
+        Number of seconds to wait between batch status checks.
+        By default, ``60``.
+    max_wait : int | float, optional
+        Maximum number of seconds to wait for the batch to finish. If
+        the batch is still running after this time, it is cancelled
+        and no responses are returned. By default, ``86400`` (24
+        hours).
+
+    Returns
+    -------
+    list of openai.types.chat.ChatCompletion | None
+        List of chat completion responses, in the same order as the
+        input `requests`. Requests that failed (or did not finish
+        within `max_wait`) are represented by ``None``.
+    """
+    responses = [None] * len(requests)
+    if not requests:
+        return responses
+
+    batch_input = "\n".join(
+        json.dumps(
+            {
+                "custom_id": str(ind),
+                "method": "POST",
+                "url": endpoint,
+                "body": body,
+            }
+        )
+        for ind, body in enumerate(requests)
+    )
+    batch_file = await client.files.create(
+        file=("batch_input.jsonl", batch_input.encode("utf-8")),
+        purpose="batch",
+    )
+    batch = await client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint=endpoint,
+        completion_window=completion_window,
+    )
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + max_wait
+    while batch.status not in _BATCH_END_STATES:
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            logger.error(
+                "Batch %s did not finish within %s seconds (status %r). "
+                "Cancelling...",
+                batch.id,
+                max_wait,
+                batch.status,
+            )
+            await _cancel_batch(client, batch.id)
+            return responses
+        await asyncio.sleep(min(poll_interval, remaining))
+        batch = await client.batches.retrieve(batch.id)
+
+    if batch.output_file_id is None:
+        logger.error(
+            "Batch %s finished with status %r and no output",
+            batch.id,
+            batch.status,
+        )
+        return responses
+
+    output = await client.files.content(batch.output_file_id)
+    for line in output.text.splitlines():
+        if not line.strip():
+            continue
+        result = json.loads(line)
+        response = result.get("response") or {}
+        if response.get("status_code") != 200:
+            logger.error(
+                "Batch request %s failed: %s",
+                result.get("custom_id"),
+                result.get("error") or response,
+            )
+            continue
+        responses[int(result["custom_id"])] = ChatCompletion.model_validate(
+            response["body"]
+        )
+    return responses
+
+
+async def _cancel_batch(client, batch_id):
+    """Cancel a running batch, logging (not raising) any API errors"""
+    try:
+        await client.batches.cancel(batch_id)
+    except openai.OpenAIError as e:
+        logger.error("Could not cancel batch %s:", batch_id)
+        logger.exception(e)
+
+
 class OpenAIService(RateLimitedService):
     """OpenAI Chat GPT query service
 
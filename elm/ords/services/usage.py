@@ -20,7 +20,9 @@ class TimedEntry:
     True
     """
 
-    def __init__(self, value):
+    __slots__ = ("value", "_time")
+
+    def __init__(self, value, _now=time.monotonic):
         """
 
         Parameters
@@ -29,7 +31,7 @@ class TimedEntry:
             Some value to store as an entry.
         """
         self.value = value
-        self._time = time.monotonic()
+        self._time = _now()
 
     def __eq__(self, other):
         return self._time == other
@@ -4,7 +4,10 @@
 These are primarily used to validate that a legal document applies to a
 particular technology (e.g. Large Wind Energy Conversion Systems).
 """
+import asyncio
+import hashlib
 import logging
+import re
 
 
 logger = logging.getLogger(__name__)
@@ -43,6 +46,20 @@ _GOOD_ACRONYM_CONTEXTS = [
     " {acronym})",
 ]
 GOOD_WIND_PHRASES = ["wind energy conversion", "wind turbine", "wind tower"]
+_NOT_WIND_WORDS_RE = re.compile("|".join(map(re.escape, NOT_WIND_WORDS)))
+_GOOD_ACRONYM_CONTEXT_KEYWORDS = [
+    {context.format(acronym=acronym) for acronym in GOOD_WIND_ACRONYMS}
+    for context in _GOOD_ACRONYM_CONTEXTS
+]
+_GOOD_WIND_PHRASE_WORDS = [
+    set(phrase.split(" ")) for phrase in GOOD_WIND_PHRASES
+]
+_GOOD_WIND_PHRASE_ONLY_WORDS = set().union(*_GOOD_WIND_PHRASE_WORDS) - set(
+    GOOD_WIND_KEYWORDS
+)
+_HEURISTIC_CACHE = {}
+_HEURISTIC_CACHE_MAX_SIZE = 4096
+_HEURISTIC_CACHE_MIN_TEXT_LEN = 1024
 
 
 class ValidationWithMemory:
@@ -73,17 +90,10 @@ class ValidationWithMemory:
         self.num_to_recall = num_to_recall
         self.memory = [{} for _ in text_chunks]
 
-    # fmt: off
-    def _inverted_mem(self, starting_ind):
-        """Inverted memory."""
-        inverted_mem = self.memory[:starting_ind + 1:][::-1]
-        yield from inverted_mem[:self.num_to_recall]
-
-    # fmt: off
-    def _inverted_text(self, starting_ind):
-        """Inverted text chunks"""
-        inverted_text = self.text_chunks[:starting_ind + 1:][::-1]
-        yield from inverted_text[:self.num_to_recall]
+    def _inverted_inds(self, starting_ind):
+        """Chunk indices to check, starting at `starting_ind` going back"""
+        stop_ind = max(-1, starting_ind - self.num_to_recall)
+        return range(starting_ind, stop_ind, -1)
 
     async def parse_from_ind(self, ind, prompt, key):
         """Validate a chunk of text.
@@ -120,21 +130,58 @@ class ValidationWithMemory:
             ``False`` otherwise.
         """
         logger.debug("Checking %r for ind %d", key, ind)
-        mem_text = zip(self._inverted_mem(ind), self._inverted_text(ind))
-        for step, (mem, text) in enumerate(mem_text):
+        for step, chunk_ind in enumerate(self._inverted_inds(ind)):
+            mem = self.memory[chunk_ind]
+            text = self.text_chunks[chunk_ind]
             logger.debug("Mem at ind %d is %s", step, mem)
             check = mem.get(key)
             if check is None:
-                content = await self.slc.call(
-                    sys_msg=prompt.format(key=key),
-                    content=text,
-                    usage_sub_label="document_content_validation",
-                )
-                check = mem[key] = content.get(key, False)
+                check = mem[key] = await self._check_chunk(text, prompt, key)
             if check:
                 return check
         return False
 
+    async def prefetch(self, inds, prompt, key):
+        """Validate several chunks concurrently and store the results.
+
+        This runs the same (single-chunk) validation query that
+        :meth:`parse_from_ind` would run for each of the input indices,
+        but submits all of the queries at once. Results are stored in
+        the validator memory, so subsequent calls to
+        :meth:`parse_from_ind` for these chunks do not query the LLM
+        again. Chunks that already have a result in memory are skipped.
+
+        Parameters
+        ----------
+        inds : iterable of int
+            Chunk indices to validate.
+        prompt : str
+            Input LLM system prompt that describes the validation
+            question. See :meth:`parse_from_ind` for details.
+        key : str
+            A key expected in the JSON output of the LLM containing the
+            response for the validation question. See
+            :meth:`parse_from_ind` for details.
+        """
+        inds = [ind for ind in inds if self.memory[ind].get(key) is None]
+        checks = await asyncio.gather(
+            *(
+                self._check_chunk(self.text_chunks[ind], prompt, key)
+                for ind in inds
+            )
+        )
+        for ind, check in zip(inds, checks):
+            self.memory[ind][key] = check
+
+    async def _check_chunk(self, text, prompt, key):
+        """Query the LLM to validate a single chunk of text"""
+        content = await self.slc.call(
+            sys_msg=prompt.format(key=key),
+            content=text,
+            usage_sub_label="document_content_validation",
+        )
+        return content.get(key, False)
+
 
 def possibly_mentions_wind(text, match_count_threshold=1):
     """Perform a heuristic check for mention of wind energy in text.
@@ -145,6 +192,10 @@ def possibly_mentions_wind(text, match_count_threshold=1):
     If enough keywords are mentions (as dictated by
     `match_count_threshold`), this check returns ``True``.
 
+    Results for longer texts are cached (keyed by a hash of the text),
+    so repeated pages (e.g. boilerplate shared between documents) are
+    only checked once.
+
     Parameters
     ----------
     text : str
@@ -161,33 +212,59 @@ def possibly_mentions_wind(text, match_count_threshold=1):
         ``True`` if the number of keywords/acronyms/phrases detected
         exceeds the `match_count_threshold`.
     """
+    if len(text) < _HEURISTIC_CACHE_MIN_TEXT_LEN:
+        return _possibly_mentions_wind(text, match_count_threshold)
+
+    key = (_text_hash(text), match_count_threshold)
+    out = _HEURISTIC_CACHE.get(key)
+    if out is None:
+        out = _possibly_mentions_wind(text, match_count_threshold)
+        if len(_HEURISTIC_CACHE) >= _HEURISTIC_CACHE_MAX_SIZE:
+            _HEURISTIC_CACHE.pop(next(iter(_HEURISTIC_CACHE)), None)
+        _HEURISTIC_CACHE[key] = out
+    return out
+
+
+def _possibly_mentions_wind(text, match_count_threshold):
+    """Uncached wind heuristic check (see `possibly_mentions_wind`)"""
     heuristics_text = _convert_to_heuristics_text(text)
-    total_keyword_matches = _count_single_keyword_matches(heuristics_text)
+    found_keywords = _find_words(heuristics_text, GOOD_WIND_KEYWORDS)
+    total_keyword_matches = len(found_keywords)
+    if total_keyword_matches > match_count_threshold:
+        return True
+
     total_keyword_matches += _count_acronym_matches(heuristics_text)
-    total_keyword_matches += _count_phrase_matches(heuristics_text)
+    if total_keyword_matches > match_count_threshold:
+        return True
+
+    found_words = found_keywords | _find_words(
+        heuristics_text, _GOOD_WIND_PHRASE_ONLY_WORDS
+    )
+    total_keyword_matches += _count_phrase_matches(found_words)
     return total_keyword_matches > match_count_threshold
 
 
+def _text_hash(text):
+    """Compact hash of text, used as a heuristic cache key."""
+    return hashlib.blake2b(
+        text.encode("utf-8", errors="ignore"), digest_size=16
+    ).digest()
+
+
 def _convert_to_heuristics_text(text):
     """Convert text for heuristic wind content parsing"""
-    heuristics_text = text.casefold()
-    for word in NOT_WIND_WORDS:
-        heuristics_text = heuristics_text.replace(word, "")
-    return heuristics_text
+    return _NOT_WIND_WORDS_RE.sub("", text.casefold())
 
 
-def _count_single_keyword_matches(heuristics_text):
-    """Count number of good wind energy keywords that appear in text."""
-    return sum(keyword in heuristics_text for keyword in GOOD_WIND_KEYWORDS)
+def _find_words(heuristics_text, words):
+    """Find the subset of `words` that appear in text."""
+    return {word for word in words if word in heuristics_text}
 
 
 def _count_acronym_matches(heuristics_text):
     """Count number of good wind energy acronyms that appear in text."""
     acronym_matches = 0
-    for context in _GOOD_ACRONYM_CONTEXTS:
-        acronym_keywords = {
-            context.format(acronym=acronym) for acronym in GOOD_WIND_ACRONYMS
-        }
+    for acronym_keywords in _GOOD_ACRONYM_CONTEXT_KEYWORDS:
         acronym_matches = sum(
             keyword in heuristics_text for keyword in acronym_keywords
         )
@@ -196,9 +273,8 @@ def _count_acronym_matches(heuristics_text):
     return acronym_matches
 
 
-def _count_phrase_matches(heuristics_text):
+def _count_phrase_matches(found_words):
     """Count number of good wind energy phrases that appear in text."""
     return sum(
-        all(keyword in heuristics_text for keyword in phrase.split(" "))
-        for phrase in GOOD_WIND_PHRASES
+        phrase_words <= found_words for phrase_words in _GOOD_WIND_PHRASE_WORDS
     )
@@ -5,13 +5,20 @@ These are primarily used to validate that a legal document applies to a
 particular location.
 """
 import asyncio
+import hashlib
 import logging
 from abc import ABC, abstractmethod
 
-from elm.ords.extraction.ngrams import convert_text_to_sentence_ngrams
+import numpy as np
+
+from elm.ords.extraction.ngrams import any_sentence_ngram_contains
+from elm.ords.services.openai import batch_chat_completions
+from elm.ords.utilities import llm_response_as_json
+from elm.ords.utilities.exceptions import ELMOrdsValueError
 
 
 logger = logging.getLogger(__name__)
+_NON_BATCH_KWARGS = {"timeout"}
 
 
 class FixedMessageValidator(ABC):
@@ -20,7 +27,13 @@ class FixedMessageValidator(ABC):
     SYSTEM_MESSAGE = None
     """LLM system message describing validation task. """
 
-    def __init__(self, structured_llm_caller):
+    def __init__(
+        self,
+        structured_llm_caller,
+        batch_mode=False,
+        batch_client=None,
+        batch_max_wait=24 * 60 * 60,
+    ):
         """
 
         Parameters
@@ -28,13 +41,44 @@ class FixedMessageValidator(ABC):
         structured_llm_caller : :class:`elm.ords.llm.StructuredLLMCaller`
             StructuredLLMCaller instance. Used for structured validation
             queries.
+        batch_mode : bool, optional
+            Option to have :meth:`check_many` submit all of its queries
+            as a single OpenAI Batch API job (using the model and
+            keyword arguments of the `structured_llm_caller`) instead
+            of one at a time through the LLM service. Batch jobs are
+            cheaper but can take hours to complete, so this should only
+            be used for offline bulk validation. :meth:`check` is not
+            affected by this input. By default, ``False``.
+        batch_client : openai.AsyncOpenAI | openai.AsyncAzureOpenAI, optional
+            Async OpenAI client used to submit batch jobs. Required if
+            ``batch_mode=True``. By default, ``None``.
+        batch_max_wait : int | float, optional
+            Maximum number of seconds to wait for a batch job to
+            finish. Any content that does not get a batch response
+            (because the job timed out or the request failed) is
+            checked using :meth:`check` instead.
+            By default, ``86400`` (24 hours).
         """
+        if batch_mode and batch_client is None:
+            msg = "Must provide a `batch_client` if `batch_mode=True`"
+            raise ELMOrdsValueError(msg)
+
         self.slc = structured_llm_caller
+        self.batch_mode = batch_mode
+        self.batch_client = batch_client
+        self.batch_max_wait = batch_max_wait
+        self._responses = {}
+        self._sys_msgs = {}
+        self._bound_checks = {}
 
     async def check(self, content, **fmt_kwargs):
         """Check if the content passes the validation.
 
         The exact validation is outlined in the class `SYSTEM_MESSAGE`.
+        LLM responses are cached on this instance (keyed by a hash of
+        the system message and content), so repeated content (e.g.
+        boilerplate pages shared between documents) is only sent to
+        the LLM once.
 
         Parameters
         ----------
@@ -49,13 +93,144 @@ class FixedMessageValidator(ABC):
             ``True`` if the content passes the validation check,
             ``False`` otherwise.
         """
-        if not content:
-            return False
-        sys_msg = self.SYSTEM_MESSAGE.format(**fmt_kwargs)
-        out = await self.slc.call(
-            sys_msg, content, usage_sub_label="document_location_validation"
+        return await self.bind(**fmt_kwargs)(content)
+
+    def bind(self, **fmt_kwargs):
+        """Create a check function for a fixed set of format arguments.
+
+        The system message is rendered once, and the LLM caller,
+        response cache, and output parser are bound to the returned
+        function, so repeated checks (e.g. one per document page) skip
+        all of the per-call formatting and attribute lookups.
+
+        Parameters
+        ----------
+        **fmt_kwargs
+            Keyword arguments to be passed to `SYSTEM_MESSAGE.format()`.
+
+        Returns
+        -------
+        callable
+            Async function that takes document content as the only
+            input and returns ``True`` if the content passes the
+            validation check, ``False`` otherwise.
+        """
+        key = tuple(sorted(fmt_kwargs.items()))
+        bound_check = self._bound_checks.get(key)
+        if bound_check is None:
+            sys_msg = self._system_message(**fmt_kwargs)
+            bound_check = self._bound_checks[key] = self._make_check(sys_msg)
+        return bound_check
+
+    def _make_check(self, sys_msg):
+        """Build a check function for a pre-rendered system message."""
+        call = self.slc.call
+        responses = self._responses
+        parse_output = self._parse_output
+
+        async def _check(content):
+            if not content:
+                return False
+            key = _response_key(sys_msg, content)
+            out = responses.get(key)
+            if out is None:
+                out = await call(
+                    sys_msg,
+                    content,
+                    usage_sub_label="document_location_validation",
+                )
+                if out:
+                    responses[key] = out
+            return parse_output(out)
+
+        return _check
+
+    async def check_many(self, contents, **fmt_kwargs):
+        """Check if each piece of content passes the validation.
+
+        If this validator was initialized with ``batch_mode=True``, all
+        uncached queries are submitted as a single OpenAI batch job.
+        Otherwise, each piece of content is checked concurrently using
+        :meth:`check`. Both paths share the same response cache.
+
+        Parameters
+        ----------
+        contents : iterable of str
+            Document contents to validate.
+        **fmt_kwargs
+            Keyword arguments to be passed to `SYSTEM_MESSAGE.format()`.
+
+        Returns
+        -------
+        list of bool
+            List where each entry is ``True`` if the corresponding
+            content passes the validation check, ``False`` otherwise.
+        """
+        contents = list(contents)
+        check = self.bind(**fmt_kwargs)
+        if self.batch_mode:
+            sys_msg = self._system_message(**fmt_kwargs)
+            to_query = {
+                _response_key(sys_msg, content): content
+                for content in contents
+                if content
+            }
+            for key in self._responses.keys() & to_query.keys():
+                del to_query[key]
+            await self._batch_query(sys_msg, to_query)
+
+        return list(await asyncio.gather(*map(check, contents)))
+
+    async def _batch_query(self, sys_msg, contents):
+        """Query the LLM for all contents using the Batch API."""
+        if not contents:
+            return
+
+        body_kwargs = {
+            key: value
+            for key, value in self.slc.kwargs.items()
+            if key not in _NON_BATCH_KWARGS
+        }
+        requests = [
+            {
+                "messages": self.slc.build_messages(sys_msg, content),
+                **body_kwargs,
+            }
+            for content in contents.values()
+        ]
+        responses = await batch_chat_completions(
+            self.batch_client, requests, max_wait=self.batch_max_wait
         )
-        return self._parse_output(out)
+        num_failed = 0
+        for key, response in zip(contents, responses):
+            if response is None:
+                num_failed += 1
+                continue
+            if self.slc.usage_tracker is not None:
+                self.slc.usage_tracker.update_from_model(
+                    response, sub_label="document_location_validation"
+                )
+            out = llm_response_as_json(response.choices[0].message.content)
+            if out:
+                self._responses[key] = out
+
+        if num_failed:
+            logger.warning(
+                "%d of %d batch validation queries did not return a "
+                "response; checking them individually",
+                num_failed,
+                len(responses),
+            )
+
+    def _system_message(self, **fmt_kwargs):
+        """Format `SYSTEM_MESSAGE`, re-using previously formatted text."""
+        key = tuple(sorted(fmt_kwargs.items()))
+        sys_msg = self._sys_msgs.get(key)
+        if sys_msg is None:
+            sys_msg = self._sys_msgs[key] = self.SYSTEM_MESSAGE.format(
+                **fmt_kwargs
+            )
+        return sys_msg
 
     @abstractmethod
     def _parse_output(self, props):
@@ -146,6 +321,55 @@ class CountyNameValidator(FixedMessageValidator):
         return not any(props.get(var) for var in check_vars)
 
 
+class CountyJurisdictionAndNameValidator(FixedMessageValidator):
+    """Validator that checks both county jurisdiction and county name.
+
+    This validator combines the checks of
+    :class:`CountyJurisdictionValidator` and
+    :class:`CountyNameValidator` into a single LLM query.
+    """
+
+    SYSTEM_MESSAGE = (
+        "You extract structured data from legal text. Return "
+        "your answer in JSON format. Your JSON file must include exactly "
+        "five keys. The first key is 'x', which is a boolean that is set to "
+        "`True` if the text excerpt explicitly mentions that the regulations "
+        "within apply to a jurisdiction scope other than {county} County "
+        "(i.e. they apply to a subdivision like a township or a city, or "
+        "they apply more broadly, like to a state or the full country). "
+        "`False` if the regulations in the text apply at the {county} County "
+        "level, if the regulations in the text apply to all unincorporated "
+        "areas of {county} County, or if there is not enough information to "
+        "determine the answer. The second key is 'y', which is a boolean "
+        "that is set to `True` if the text excerpt explicitly mentions that "
+        "the regulations within apply to more than one county. `False` if "
+        "the regulations in the text excerpt apply to a single county only "
+        "or if there is not enough information to determine the answer. The "
+        "third key is 'wrong_county', which is a boolean that is set to "
+        "`True` if the legal text is not for {county} County. Do not infer "
+        "based on any information about any US state, city, township, or "
+        "otherwise. `False` if the text applies to {county} County or if "
+        "there is not enough information to determine the answer. The "
+        "fourth key is 'wrong_state', which is a boolean that is set to "
+        "`True` if the legal text is not for a county in {state} State. Do "
+        "not infer based on any information about any US county, city, "
+        "township, or otherwise. `False` if the text applies to a county in "
+        "{state} State or if there is not enough information to determine "
+        "the answer. The fifth key is 'explanation', which is a string that "
+        "contains a short explanation if you chose `True` for any answers "
+        "above."
+    )
+
+    def _parse_output(self, props):
+        """Parse LLM response and return `True` if the document passes."""
+        logger.debug(
+            "Parsing county jurisdiction and name validation output:\n\t%s",
+            props,
+        )
+        check_vars = ("x", "y", "wrong_county", "wrong_state")
+        return not any(props.get(var) for var in check_vars)
+
+
 class CountyValidator:
     """ELM Ords County validator.
 
@@ -159,14 +383,19 @@ class CountyValidator:
     Key Relationships:
         Uses a :class:`~elm.ords.llm.calling.StructuredLLMCaller` for
         LLM queries and delegates sub-validation to
-        :class:`~elm.ords.validation.location.CountyNameValidator`,
-        :class:`~elm.ords.validation.location.CountyJurisdictionValidator`,
-        and :class:`~elm.ords.validation.location.URLValidator`.
+        :class:`~.CountyJurisdictionValidator`,
+        :class:`~.CountyJurisdictionAndNameValidator`,
+        and :class:`~.URLValidator`.
 
     .. end desc
     """
 
-    def __init__(self, structured_llm_caller, score_thresh=0.8):
+    def __init__(
+        self,
+        structured_llm_caller,
+        score_thresh=0.8,
+        max_concurrent_page_checks=16,
+    ):
         """
 
         Parameters
@@ -177,10 +406,19 @@ class CountyValidator:
         score_thresh : float, optional
             Score threshold to exceed when voting on content from raw
             pages. By default, ``0.8``.
+        max_concurrent_page_checks : int, optional
+            Maximum number of raw page LLM checks to have in flight at
+            once for a single document. Keeping this bounded limits the
+            number of LLM calls that are wasted when the page vote is
+            decided early. If ``None``, all pages are checked at once.
+            By default, ``16``.
         """
         self.score_thresh = score_thresh
-        self.cn_validator = CountyNameValidator(structured_llm_caller)
+        self.max_concurrent_page_checks = max_concurrent_page_checks
         self.cj_validator = CountyJurisdictionValidator(structured_llm_caller)
+        self.cjn_validator = CountyJurisdictionAndNameValidator(
+            structured_llm_caller
+        )
         self.url_validator = URLValidator(structured_llm_caller)
 
     async def check(self, doc, county, state):
@@ -208,88 +446,144 @@ class CountyValidator:
         logger.debug(
             "Validating document from source: %s", source or "Unknown"
         )
-        logger.debug("Checking for correct for jurisdiction...")
-        jurisdiction_is_county = await _validator_check_for_doc(
-            validator=self.cj_validator,
-            doc=doc,
-            score_thresh=self.score_thresh,
-            county=county,
-        )
-        if not jurisdiction_is_county:
-            return False
-
         logger.debug(
             "Checking URL (%s) for county name...", source or "Unknown"
         )
-        url_is_county = await self.url_validator.check(
-            source, county=county, state=state
+        url_check = asyncio.create_task(
+            self.url_validator.check(source, county=county, state=state),
+            name=asyncio.current_task().get_name(),
         )
-        if url_is_county:
-            return True
-
         logger.debug(
             "Checking text for county name (heuristic; URL: %s)...",
             source or "Unknown",
         )
-        correct_county_heuristic = _heuristic_check_for_county_and_state(
-            doc, county, state
+        correct_county_heuristic = await asyncio.to_thread(
+            _heuristic_check_for_county_and_state, doc, county, state
         )
         logger.debug(
             "Found county name in text (heuristic): %s",
             correct_county_heuristic,
         )
         if correct_county_heuristic:
-            return True
+            url_check.cancel()
+            url_is_county = False
+        else:
+            url_is_county = await url_check
+
+        if correct_county_heuristic or url_is_county:
+            logger.debug("Checking for correct for jurisdiction...")
+            validator = self.cj_validator
+        else:
+            logger.debug(
+                "Checking text for correct jurisdiction and county name "
+                "(LLM; URL: %s)...",
+                source or "Unknown",
+            )
+            validator = self.cjn_validator
 
-        logger.debug(
-            "Checking text for county name (LLM; URL: %s)...",
-            source or "Unknown",
-        )
         return await _validator_check_for_doc(
-            validator=self.cn_validator,
+            validator=validator,
             doc=doc,
             score_thresh=self.score_thresh,
+            max_concurrency=self.max_concurrent_page_checks,
             county=county,
             state=state,
         )
 
 
-def _heuristic_check_for_county_and_state(doc, county, state):
-    """Check if county and state names are in doc"""
-    return any(
-        any(
-            (county.lower() in fg and state.lower() in fg)
-            for fg in convert_text_to_sentence_ngrams(t.lower(), 5)
-        )
-        for t in doc.pages
-    )
+def _response_key(sys_msg, content):
+    """Compact hash of a system message and content pair."""
+    return hashlib.blake2b(
+        f"{sys_msg}\0{content}".encode("utf-8", errors="ignore"),
+        digest_size=16,
+    ).digest()
 
 
-async def _validator_check_for_doc(validator, doc, score_thresh=0.8, **kwargs):
-    """Apply a validator check to a doc's raw pages."""
+def _heuristic_check_for_county_and_state(doc, county, state):
+    """Check if county and state names are in doc"""
+    county, state = county.casefold(), state.casefold()
+    words = {county, state}
+    min_page_len = max(len(county), len(state))
+    for page in doc.pages:
+        # skip short pages (e.g. TOC entries) without lowercasing them
+        if len(page) < min_page_len:
+            continue
+        text = page.lower()
+        # cheap substring pre-check before tokenizing the page
+        if county not in text or state not in text:
+            continue
+        if any_sentence_ngram_contains(text, words, 5):
+            return True
+    return False
+
+
+async def _validator_check_for_doc(
+    validator,
+    doc,
+    score_thresh=0.8,
+    weights=None,
+    max_concurrency=None,
+    **kwargs,
+):
+    """Apply a validator check to a doc's raw pages.
+
+    Pages are checked concurrently, and the weighted vote is updated as
+    each check completes. As soon as the outcome of the vote is decided
+    (i.e. the remaining pages can no longer change the result), any
+    outstanding checks are cancelled.
+    """
+    pages = doc.raw_pages
+    if weights is None:
+        weights = _page_weights(pages)
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    check = validator.bind(**kwargs)
     outer_task_name = asyncio.current_task().get_name()
     validation_checks = [
         asyncio.create_task(
-            validator.check(text, **kwargs), name=outer_task_name
+            _weighted_check(check, text, weight, semaphore),
+            name=outer_task_name,
         )
-        for text in doc.raw_pages
+        for text, weight in zip(pages, weights)
     ]
-    out = await asyncio.gather(*validation_checks)
-    score = _weighted_vote(out, doc)
+
+    total_weight = remaining_weight = int(np.sum(weights))
+    pass_weight = score_thresh * total_weight
+    total = 0
+    try:
+        for weighted_verdict in asyncio.as_completed(validation_checks):
+            weight, verdict = await weighted_verdict
+            remaining_weight -= weight
+            if verdict:
+                total += weight
+            if total > pass_weight or total + remaining_weight <= pass_weight:
+                break
+    finally:
+        for task in validation_checks:
+            task.cancel()
+
+    passed = total > pass_weight
     logger.debug(
-        "%s score is %.2f for doc from source %s (Pass: %s)",
+        "%s score is %.2f (%.2f undecided) for doc from source %s "
+        "(Pass: %s)",
         validator.__class__.__name__,
-        score,
+        total / total_weight if total_weight else 0,
+        remaining_weight / total_weight if total_weight else 0,
         doc.metadata.get("source", "Unknown"),
-        str(score > score_thresh),
+        str(passed),
     )
-    return score > score_thresh
+    return passed
+
+
+async def _weighted_check(check, text, weight, semaphore):
+    """Run a bound validator check and return it with the page weight."""
+    if semaphore is None:
+        verdict = await check(text)
+    else:
+        async with semaphore:
+            verdict = await check(text)
+    return weight, verdict
 
 
-def _weighted_vote(out, doc):
-    """Compute weighted average of responses based on text length."""
-    if not doc.raw_pages:
-        return 0
-    weights = [len(text) for text in doc.raw_pages]
-    total = sum(verdict * weight for verdict, weight in zip(out, weights))
-    return total / sum(weights)
+def _page_weights(pages):
+    """Array of page lengths, used to weight the page verdicts."""
+    return np.fromiter(map(len, pages), dtype=np.int64, count=len(pages))
@@ -5,17 +5,22 @@ ELM PDF to text parser
 """
 import os
 import subprocess
-import requests
-import tempfile
-import copy
+import json
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from PyPDF2 import PdfReader
 import logging
 
-from elm.base import ApiBase
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+from elm.base import ApiBase, _response_content
 from elm.utilities.parse import is_multi_col, combine_pages, clean_headers
 
 
 logger = logging.getLogger(__name__)
+_CLEAN_CHARS_TABLE = str.maketrans(dict.fromkeys('\n.,-/:', ' '))
 
 
 class PDFtoTXT(ApiBase):
@@ -33,7 +38,29 @@ class PDFtoTXT(ApiBase):
                          'without comments or added information.')
     """Instructions to the model with python format braces for pdf text"""
 
-    def __init__(self, fp, page_range=None, model=None):
+    BATCH_MODEL_INSTRUCTION = ('Text extracted from {n_pages} pages of a '
+                               'PDF document:\n\n{pages}\n\n'
+                               'The text above was extracted from a PDF '
+                               'document. Can you make each page nicely '
+                               'formatted? Please only return the formatted '
+                               'text without comments or added information. '
+                               'Return your answer as a JSON object with a '
+                               'single key "pages", which is a list of '
+                               '{n_pages} objects (one per page, in order) '
+                               'with the keys "n" (page number) and "text" '
+                               '(formatted page text).')
+    """Instructions to the model for cleaning several pages in one request.
+    Format args `n_pages` and `pages` are filled in at runtime."""
+
+    MIN_PARALLEL_LOAD_PAGES = 64
+    """Minimum number of pages to extract in parallel worker processes"""
+
+    MIN_VALIDATION_WORDS = 10
+    """Minimum number of unique raw words for a page to be validated.
+    Pages with fewer words (e.g. cover pages) are skipped by
+    validate_clean()"""
+
+    def __init__(self, fp, page_range=None, model=None, max_workers=None):
         """
         Parameters
         ----------
@@ -45,14 +72,20 @@ class PDFtoTXT(ApiBase):
         model : None | str
             Optional specification of OpenAI model to use. Default is
             cls.DEFAULT_MODEL
+        max_workers : None | int
+            Optional number of worker processes to use for text extraction
+            when loading at least `MIN_PARALLEL_LOAD_PAGES` pages. If None,
+            defaults to the number of CPUs. Set to 1 to always extract
+            pages serially in the calling process (e.g. when this class
+            is used inside another process pool).
         """
         super().__init__(model)
         self.fp = fp
-        self.raw_pages = self.load_pdf(page_range)
+        self.raw_pages = self.load_pdf(page_range, max_workers=max_workers)
         self.pages = self.raw_pages
         self.full = combine_pages(self.raw_pages)
 
-    def load_pdf(self, page_range):
+    def load_pdf(self, page_range, max_workers=None):
         """Basic load of pdf to text strings
 
         Parameters
@@ -60,6 +93,11 @@ class PDFtoTXT(ApiBase):
         page_range : None | list
             Optional 2-entry list/tuple to set starting and ending pages
             (python indexing)
+        max_workers : None | int
+            Optional number of worker processes to use for text extraction
+            when loading at least `MIN_PARALLEL_LOAD_PAGES` pages. If None,
+            defaults to the number of CPUs. Set to 1 to always extract
+            pages serially.
 
         Returns
         -------
@@ -69,8 +107,6 @@ class PDFtoTXT(ApiBase):
         """
 
         logger.info('Loading PDF: {}'.format(self.fp))
-        out = []
-        pdf = PdfReader(self.fp)
 
         if page_range is not None:
             assert len(page_range) == 2
@@ -78,11 +114,16 @@ class PDFtoTXT(ApiBase):
         else:
             page_range = slice(0, None)
 
-        for i, page in enumerate(pdf.pages[page_range]):
-            page_text = page.extract_text()
+        pages, num_pages = _load_pages(
+            self.fp, page_range, max_workers=max_workers,
+            min_parallel_pages=self.MIN_PARALLEL_LOAD_PAGES)
+
+        out = []
+        for i, page_text in enumerate(pages):
             if len(page_text.strip()) == 0:
                 logger.debug('Skipping empty page {} out of {}'
-                             .format(i + 1 + page_range.start, len(pdf.pages)))
+                             .format(i + 1 + (page_range.start or 0),
+                                     num_pages))
             else:
                 out.append(page_text)
 
@@ -126,22 +167,14 @@ class PDFtoTXT(ApiBase):
         clean_pages = []
 
         for i, raw_page in enumerate(self.raw_pages):
-            msg = self.make_gpt_messages(copy.deepcopy(raw_page))
+            msg = self.make_gpt_messages(raw_page)
             req = {"model": self.model, "messages": msg, "temperature": 0.0}
 
-            kwargs = dict(url=self.URL, headers=self.HEADERS, json=req)
+            content = self._get_cached_response(req)
+            if content is None:
+                content = self._clean_page(req)
+                self._cache_response(req, content)
 
-            try:
-                response = requests.post(**kwargs)
-                response = response.json()
-            except Exception as e:
-                msg = 'Error in OpenAI API call!'
-                logger.exception(msg)
-                response = {'error': str(e)}
-
-            choice = response.get('choices', [{'message': {'content': ''}}])[0]
-            message = choice.get('message', {'content': ''})
-            content = message.get('content', '')
             clean_pages.append(content)
             logger.debug('Cleaned page {} out of {}'
                          .format(i + 1, len(self.raw_pages)))
@@ -154,7 +187,24 @@ class PDFtoTXT(ApiBase):
 
         return clean_pages
 
-    async def clean_txt_async(self, ignore_error=None, rate_limit=40e3):
+    def _clean_page(self, req):
+        """Send a single page cleaning request to the OpenAI API"""
+        kwargs = dict(url=self.URL, headers=self.HEADERS, json=req)
+
+        try:
+            response = self.session.post(**kwargs)
+            response = response.json()
+        except Exception as e:
+            msg = 'Error in OpenAI API call!'
+            logger.exception(msg)
+            response = {'error': str(e)}
+
+        choice = response.get('choices', [{'message': {'content': ''}}])[0]
+        message = choice.get('message', {'content': ''})
+        return message.get('content', '')
+
+    async def clean_txt_async(self, ignore_error=None, rate_limit=40e3,
+                              batch_pages=1):
         """Use GPT to clean raw pdf text in parallel calls to the OpenAI API.
 
         NOTE: you need to call this using the await command in ipython or
@@ -171,6 +221,12 @@ class PDFtoTXT(ApiBase):
             gpt-3.5-turbo limit is 90k as of 4/2023, but we're using a large
             factor of safety (~1/2) because we can only count the tokens on the
             input side and assume the output is about the same count.
+        batch_pages : int
+            Number of pages to clean per API request. Values larger than 1
+            send groups of pages in a single request (with a JSON response
+            format) to reduce the number of API calls. Any group whose
+            response cannot be parsed is re-sent one page per request.
+            Must be at least 1.
 
         Returns
         -------
@@ -179,24 +235,52 @@ class PDFtoTXT(ApiBase):
             PDF
         """
 
+        if batch_pages < 1:
+            msg = ('batch_pages must be at least 1, got {}'
+                   .format(batch_pages))
+            logger.error(msg)
+            raise ValueError(msg)
+
         logger.info('Cleaning PDF text asyncronously...')
 
+        inds = list(range(len(self.raw_pages)))
+        groups = [inds[i:i + batch_pages]
+                  for i in range(0, len(inds), batch_pages)]
+        batched = [group for group in groups if len(group) > 1]
+        single = [group[0] for group in groups if len(group) == 1]
+
+        clean_pages = [''] * len(self.raw_pages)
+        if batched:
+            batch_requests = [self._batch_request(group) for group in batched]
+            responses = await self.call_api_async(self.URL, self.HEADERS,
+                                                  batch_requests,
+                                                  ignore_error=ignore_error,
+                                                  rate_limit=rate_limit)
+            for group, response in zip(batched, responses):
+                pages = _parse_batch_pages(_response_content(response),
+                                           len(group))
+                if pages is None:
+                    logger.warning('Could not parse cleaned text for pages '
+                                   '{}-{}; cleaning them one at a time.'
+                                   .format(group[0] + 1, group[-1] + 1))
+                    single += group
+                    continue
+                for i, page in zip(group, pages):
+                    clean_pages[i] = page
+
         all_request_jsons = []
-        for page in self.raw_pages:
-            msg = self.make_gpt_messages(page)
+        for i in single:
+            msg = self.make_gpt_messages(self.raw_pages[i])
             req = {"model": self.model, "messages": msg, "temperature": 0.0}
             all_request_jsons.append(req)
 
-        clean_pages = await self.call_api_async(self.URL, self.HEADERS,
-                                                all_request_jsons,
-                                                ignore_error=ignore_error,
-                                                rate_limit=rate_limit)
+        responses = await self.call_api_async(self.URL, self.HEADERS,
+                                              all_request_jsons,
+                                              ignore_error=ignore_error,
+                                              rate_limit=rate_limit)
 
-        for i, page in enumerate(clean_pages):
-            choice = page.get('choices', [{'message': {'content': ''}}])[0]
-            message = choice.get('message', {'content': ''})
-            content = message.get('content', '')
-            clean_pages[i] = content
+        for i, response in zip(single, responses):
+            clean_pages[i] = _response_content(response)
 
         logger.info('Finished cleaning PDF.')
 
@@ -206,6 +290,19 @@ class PDFtoTXT(ApiBase):
 
         return clean_pages
 
+    def _batch_request(self, page_inds):
+        """Make the API request json to clean several pages at once"""
+        pages = ['Page {}:\n"""\n{}\n"""'.format(n + 1, self.raw_pages[i])
+                 for n, i in enumerate(page_inds)]
+        pages = '\n\n'.join(pages)
+        query = self.BATCH_MODEL_INSTRUCTION.format(n_pages=len(page_inds),
+                                                    pages=pages)
+        messages = [{"role": "system", "content": self.MODEL_ROLE},
+                    {"role": "user", "content": query}]
+        return {"model": self.model, "messages": messages,
+                "temperature": 0.0,
+                "response_format": {"type": "json_object"}}
+
     def clean_poppler(self, layout=True):
         """Clean the pdf using the poppler pdftotxt utility
 
@@ -225,71 +322,67 @@ class PDFtoTXT(ApiBase):
         out : str
             Joined cleaned pages
         """
+        self.pages = self._poppler_pages(layout=layout)
+        self.full = combine_pages(self.pages)
 
-        with tempfile.TemporaryDirectory() as td:
-            fp_out = os.path.join(td, 'poppler_out.txt')
-            args = ['pdftotext', f"{self.fp}", f"{fp_out}"]
-            if layout:
-                args.insert(1, '-layout')
-
-            if not os.path.exists(os.path.dirname(fp_out)):
-                os.makedirs(os.path.dirname(fp_out), exist_ok=True)
-
-            try:
-                stdout = subprocess.run(args, check=True,
-                                        stdout=subprocess.PIPE)
-            except Exception as e:
-                msg = ('PDF cleaning with poppler failed! This usually '
-                       'because you have not installed the poppler utility '
-                       '(see https://poppler.freedesktop.org/). '
-                       f'Full error: {e}')
-                logger.exception(msg)
-                raise RuntimeError(msg) from e
-            else:
-                if stdout.returncode != 0:
-                    msg = ('Poppler raised return code {}: {}'
-                           .format(stdout.returncode, stdout))
-                    logger.exception(msg)
-                    raise RuntimeError(msg)
+        return self.full
 
-            with open(fp_out, 'r') as f:
-                clean_txt = f.read()
+    def _poppler_pages(self, layout=True):
+        """Get the non-empty pages of text from the poppler pdftotxt utility
 
-        # break on poppler page break
-        self.pages = clean_txt.split('\x0c')
-        remove = []
-        for i, page in enumerate(self.pages):
-            if not any(page.strip()):
-                remove.append(i)
-        for i in remove[::-1]:
-            _ = self.pages.pop(i)
+        This does not modify the state of this instance, so it can safely be
+        run concurrently for different `layout` inputs.
+        """
 
-        self.full = combine_pages(self.pages)
+        args = ['pdftotext', f"{self.fp}", '-']
+        if layout:
+            args.insert(1, '-layout')
+
+        try:
+            stdout = subprocess.run(args, check=True,
+                                    stdout=subprocess.PIPE)
+        except Exception as e:
+            msg = ('PDF cleaning with poppler failed! This usually '
+                   'because you have not installed the poppler utility '
+                   '(see https://poppler.freedesktop.org/). '
+                   f'Full error: {e}')
+            logger.exception(msg)
+            raise RuntimeError(msg) from e
+        else:
+            if stdout.returncode != 0:
+                msg = ('Poppler raised return code {}: {}'
+                       .format(stdout.returncode, stdout))
+                logger.exception(msg)
+                raise RuntimeError(msg)
 
-        return self.full
+        clean_txt = stdout.stdout.decode('utf-8', errors='replace')
+
+        # break on poppler page break
+        pages = clean_txt.split('\x0c')
+        return [page for page in pages if page.strip()]
 
     def validate_clean(self):
         """Run some basic checks on the GPT cleaned text vs. the raw text"""
-        repl = ('\n', '.', ',', '-', '/', ':')
 
         if not any(self.full.replace('\n', '').strip()):
             msg = 'Didnt get ANY clean output text!'
             logger.error(msg)
             raise RuntimeError(msg)
 
-        def replace_chars_for_clean(text):
-            for char in repl:
-                text = text.replace(char, ' ')
-            return text
-
         for i, (raw, clean) in enumerate(zip(self.raw_pages, self.pages)):
-            raw_words = replace_chars_for_clean(raw).split(' ')
-            clean_words = replace_chars_for_clean(clean).split(' ')
-
+            raw_words = raw.translate(_CLEAN_CHARS_TABLE).split(' ')
             raw_words = {x for x in raw_words if len(x) > 2}
+            if len(raw_words) < self.MIN_VALIDATION_WORDS:
+                logger.debug('Skipping validation of page {} of {} with only '
+                             '{} unique words in the raw text.'
+                             .format(i + 1, len(self.raw_pages),
+                                     len(raw_words)))
+                continue
+
+            clean_words = clean.translate(_CLEAN_CHARS_TABLE).split(' ')
             clean_words = {x for x in clean_words if len(x) > 2}
 
-            isin = sum(x in clean_words for x in raw_words)
+            isin = len(raw_words & clean_words)
 
             perc = 100
             if isin > 0 and len(raw_words) > 0:
@@ -355,9 +448,18 @@ class PDFtoTXT(ApiBase):
         text : str
             Text string containing contents from pdf
         """
-        text = self.clean_poppler(layout=True)
-        if is_multi_col(text, separator=separator):
-            text = self.clean_poppler(layout=False)
+        # Run both poppler layouts at once. The non-layout output is only
+        # used if the layout output turns out to have multiple columns,
+        # but leaving the executor block always waits for the second
+        # poppler process so that it never outlives this call.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            no_layout_pages = executor.submit(self._poppler_pages,
+                                              layout=False)
+            self.pages = self._poppler_pages(layout=True)
+            self.full = combine_pages(self.pages)
+            if is_multi_col(self.full, separator=separator):
+                self.pages = no_layout_pages.result()
+                self.full = combine_pages(self.pages)
 
         clean_header_kwargs = clean_header_kwargs or {}
         text = self.clean_headers(**clean_header_kwargs)
@@ -368,3 +470,110 @@ class PDFtoTXT(ApiBase):
                 logger.info(f'Saved: {txt_fp}')
 
         return text
+
+
+def _parse_batch_pages(content, n_pages):
+    """Parse cleaned pages from a batched page cleaning response
+
+    Returns None if the response does not contain exactly `n_pages`
+    pages of text.
+    """
+    try:
+        pages = json.loads(content)['pages']
+        pages = [page['text'] for page in pages]
+    except (ValueError, TypeError, KeyError):
+        return None
+
+    if len(pages) != n_pages or not all(isinstance(p, str) for p in pages):
+        return None
+
+    return pages
+
+
+def _load_pages(fp, page_range, max_workers=None, min_parallel_pages=64):
+    """Extract raw text for a range of PDF pages
+
+    Pages are extracted with pypdfium2 if it is installed and with
+    PyPDF2 otherwise. The document is opened once to count its pages,
+    and small page ranges (or any range if `max_workers` is 1) are
+    extracted from that same open document. Large page ranges are split
+    into contiguous chunks that are extracted in parallel worker
+    processes (each worker opens its own copy of the document).
+
+    Returns the list of page texts and the total number of pages in the
+    document.
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    pdf = _open_pdf(fp)
+    try:
+        num_pages = _page_count(pdf)
+        page_inds = range(num_pages)[page_range]
+        if max_workers < 2 or len(page_inds) < min_parallel_pages:
+            return _page_texts(pdf, page_inds), num_pages
+    finally:
+        _close_pdf(pdf)
+
+    chunk_size = max(1, -(-len(page_inds) // (4 * max_workers)))
+    chunks = [page_inds[i:i + chunk_size]
+              for i in range(0, len(page_inds), chunk_size)]
+    logger.debug('Extracting {} PDF pages using {} workers'
+                 .format(len(page_inds), max_workers))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        texts = executor.map(_extract_page_texts, [fp] * len(chunks), chunks)
+        return [text for chunk in texts for text in chunk], num_pages
+
+
+def _extract_page_texts(fp, page_inds):
+    """Open a PDF and extract raw text for the given page indices"""
+    pdf = _open_pdf(fp)
+    try:
+        return _page_texts(pdf, page_inds)
+    finally:
+        _close_pdf(pdf)
+
+
+def _open_pdf(fp):
+    """Open a PDF document with pypdfium2 if available, else PyPDF2"""
+    if pdfium is None:
+        return PdfReader(fp)
+    return pdfium.PdfDocument(fp)
+
+
+def _close_pdf(pdf):
+    """Close a PDF document opened with `_open_pdf`"""
+    if not isinstance(pdf, PdfReader):
+        pdf.close()
+
+
+def _page_count(pdf):
+    """Get the total number of pages in an open PDF document"""
+    if isinstance(pdf, PdfReader):
+        return len(pdf.pages)
+    return len(pdf)
+
+
+def _page_texts(pdf, page_inds):
+    """Extract raw text for the given page indices of an open PDF"""
+    if isinstance(pdf, PdfReader):
+        return _pypdf2_page_texts(pdf, page_inds)
+    return _pdfium_page_texts(pdf, page_inds)
+
+
+def _pdfium_page_texts(pdf, page_inds):
+    """Extract raw text for the given page indices using pypdfium2"""
+    out = []
+    for i in page_inds:
+        page = pdf[i]
+        text_page = page.get_textpage()
+        try:
+            text = text_page.get_text_range()
+        finally:
+            text_page.close()
+            page.close()
+        out.append(text.replace('\r\n', '\n'))
+    return out
+
+
+def _pypdf2_page_texts(pdf, page_inds):
+    """Extract raw text for the given page indices using PyPDF2"""
+    return [pdf.pages[i].extract_text() for i in page_inds]
@@ -5,8 +5,12 @@ Research Summarization and Distillation with LLMs
 import logging
 import os
 
+import numpy as np
+import openai
+
 from elm.base import ApiBase
 from elm.chunk import Chunker
+from elm.utilities.cache import LLMResponseCache
 
 
 logger = logging.getLogger(__name__)
@@ -42,7 +46,19 @@ class Summary(ApiBase):
             400-600 words seems to work quite well with GPT-4. This gets
             formatted into the MODEL_INSTRUCTION attribute.
         chunk_kwargs : dict | None
-            kwargs for initialization of :class:`elm.chunk.Chunker`
+            kwargs for initialization of :class:`elm.chunk.Chunker`. Pass a
+            `chunk_cache` (:class:`~elm.utilities.cache.LLMResponseCache`)
+            to skip re-chunking text that has already been chunked with the
+            same settings.
+
+        Notes
+        -----
+        Set the `semantic_cache` attribute to a
+        :class:`~elm.utilities.cache.SemanticResponseCache` instance to
+        re-use chunk summaries for near-duplicate text chunks (detected by
+        embedding similarity) instead of querying the LLM again. Cached
+        summaries are only re-used for the same model, model role,
+        prompt (including `n_words`), and temperature.
         """
 
         super().__init__(model)
@@ -62,6 +78,29 @@ class Summary(ApiBase):
             self.text_chunks = self.text
 
         self.summary_chunks = []
+        self.semantic_cache = None
+
+    def _query_parts(self):
+        """Split the formatted MODEL_INSTRUCTION around the text chunk
+
+        The instruction is formatted once (with `n_words` and a sentinel
+        in place of the text chunk), so each query can be built with a
+        simple ``text_chunk.join(parts)`` instead of re-formatting the
+        template for every chunk.
+        """
+        query = self.MODEL_INSTRUCTION.format(text_chunk='\x00',
+                                              n_words=self.n_words)
+        return query.split('\x00')
+
+    def _semantic_cache_namespace(self, temperature):
+        """Namespace for semantic cache entries of this summary request
+
+        Summaries depend on the model, role, prompt (which includes
+        `n_words`), and temperature, so cached summaries must only be
+        re-used if all of these match.
+        """
+        return LLMResponseCache.make_key(self.model, self.MODEL_ROLE,
+                                         temperature, *self._query_parts())
 
     def combine(self, text_summary):
         """Combine separate chunk summaries into one more comprehensive
@@ -106,18 +145,35 @@ class Summary(ApiBase):
         logger.info('Summarizing {} text chunks in serial...'
                     .format(len(self.text_chunks)))
         summary = ''
+        query_parts = self._query_parts()
+        namespace = self._semantic_cache_namespace(temperature)
 
         for i, chunk in enumerate(self.text_chunks):
             logger.debug('Summarizing text chunk {} out of {}'
                          .format(i + 1, len(self.text_chunks)))
 
-            msg = self.MODEL_INSTRUCTION.format(text_chunk=chunk,
-                                                n_words=self.n_words)
-            response = self.generic_query(msg, model_role=self.MODEL_ROLE,
-                                          temperature=temperature)
+            embedding = response = None
+            if self.semantic_cache is not None:
+                embedding = self.get_embedding(chunk)
+                response = self.semantic_cache.get(embedding, namespace)
+
+            if response is None:
+                msg = chunk.join(query_parts)
+                response = self.generic_query(msg,
+                                              model_role=self.MODEL_ROLE,
+                                              temperature=temperature)
+                if embedding is not None and response:
+                    self.semantic_cache.put(embedding, response, namespace)
+            else:
+                logger.debug('Re-using cached summary for similar text '
+                             'chunk {}'.format(i + 1))
+
             self.summary_chunks.append(response)
             summary += f'\n\n{response}'
 
+        if self.semantic_cache is not None:
+            self.semantic_cache.save()
+
         if fancy_combine:
             summary = self.combine(summary)
 
@@ -160,18 +216,36 @@ class Summary(ApiBase):
         logger.info('Summarizing {} text chunks asynchronously...'
                     .format(len(self.text_chunks)))
 
-        queries = []
-        for chunk in self.text_chunks:
-            msg = self.MODEL_INSTRUCTION.format(text_chunk=chunk,
-                                                n_words=self.n_words)
-            queries.append(msg)
-
-        summaries = await self.generic_async_query(queries,
+        summaries = [None] * len(self.text_chunks)
+        embeddings = [None] * len(self.text_chunks)
+        sources = list(range(len(self.text_chunks)))
+        namespace = self._semantic_cache_namespace(temperature)
+        if self.semantic_cache is not None:
+            embeddings = await self._embed_chunks_async(rate_limit)
+            summaries, sources = self._match_similar_chunks(embeddings,
+                                                            namespace)
+
+        todo = [i for i, summary in enumerate(summaries)
+                if summary is None and sources[i] == i]
+        query_parts = self._query_parts()
+        queries = (self.text_chunks[i].join(query_parts) for i in todo)
+
+        responses = await self.generic_async_query(queries,
                                                    model_role=self.MODEL_ROLE,
                                                    temperature=temperature,
                                                    ignore_error=ignore_error,
                                                    rate_limit=rate_limit)
 
+        for i, response in zip(todo, responses):
+            summaries[i] = response
+            if (embeddings[i] is not None and isinstance(response, str)
+                    and response):
+                self.semantic_cache.put(embeddings[i], response, namespace)
+
+        summaries = [summaries[source] for source in sources]
+        if self.semantic_cache is not None:
+            self.semantic_cache.save()
+
         self.summary_chunks = summaries
         summary = '\n\n'.join(summaries)
 
@@ -181,3 +255,60 @@ class Summary(ApiBase):
         logger.info('Finished all summaries.')
 
         return summary
+
+    def _match_similar_chunks(self, embeddings, namespace):
+        """Find cached summaries and near-duplicate chunks in this run
+
+        Returns the list of cached summaries (None if not cached) and a
+        list with the index of the chunk whose summary should be used for
+        each chunk (near-duplicate chunks point to their first occurrence).
+        """
+        summaries = [None] * len(embeddings)
+        sources = list(range(len(embeddings)))
+        first_inds, first_embeddings = [], []
+        for i, embedding in enumerate(embeddings):
+            if embedding is None:
+                continue
+
+            summaries[i] = self.semantic_cache.get(embedding, namespace)
+            if summaries[i] is not None:
+                continue
+
+            embedding = np.asarray(embedding, dtype=float)
+            embedding = embedding / (np.linalg.norm(embedding) or 1)
+            if first_embeddings:
+                scores = np.array(first_embeddings) @ embedding
+                best = int(np.argmax(scores))
+                if scores[best] > self.semantic_cache.threshold:
+                    sources[i] = first_inds[best]
+                    continue
+
+            first_inds.append(i)
+            first_embeddings.append(embedding)
+
+        return summaries, sources
+
+    async def _embed_chunks_async(self, rate_limit):
+        """Get the embeddings for all text chunks (None for failed chunks)"""
+        all_request_jsons = []
+        for chunk in self.text_chunks:
+            req = {"input": chunk, "model": self.EMBEDDING_MODEL}
+            if 'azure' in str(openai.api_type).lower():
+                req['engine'] = self.EMBEDDING_MODEL
+            all_request_jsons.append(req)
+
+        embeddings = await self.call_api_async(self.EMBEDDING_URL,
+                                               self.HEADERS,
+                                               all_request_jsons,
+                                               rate_limit=rate_limit)
+
+        for i, response in enumerate(embeddings):
+            try:
+                embeddings[i] = response['data'][0]['embedding']
+            except Exception:
+                logger.error('Could not get embedding for text chunk {}, '
+                             'received API response: {}'
+                             .format(i + 1, response))
+                embeddings[i] = None
+
+        return embeddings
@@ -64,6 +64,7 @@ class DecisionTree:
         """
         self._g = graph
         self._history = []
+        self._txt_fmt = None
         assert isinstance(self.graph, nx.DiGraph)
         assert 'api' in self.graph.graph
 
@@ -130,6 +131,27 @@ class DecisionTree:
         """
         return self._g
 
+    @property
+    def txt_fmt(self):
+        """Get the graph attributes used to format the node prompts (all
+        high-level graph attributes except "api"). These are cached and
+        refreshed at the start of every run and after every node callback.
+        Call :meth:`invalidate_fmt_cache` if the graph attributes are
+        modified in any other way.
+
+        Returns
+        -------
+        dict
+        """
+        if self._txt_fmt is None:
+            self._txt_fmt = {k: v for k, v in self.graph.graph.items()
+                             if k != 'api'}
+        return self._txt_fmt
+
+    def invalidate_fmt_cache(self):
+        """Clear the cached prompt format attributes (see :attr:`txt_fmt`)"""
+        self._txt_fmt = None
+
     def call_node(self, node_name):
         """Call the LLM with the prompt from the input node and search the
         successor edges for a valid transition condition
@@ -153,46 +175,48 @@ class DecisionTree:
         if 'callback' in node:
             callback = node['callback']
             callback(out, self, node_name)
+            self.invalidate_fmt_cache()
 
         return self._parse_graph_output(node_name, out)
 
     def _prepare_graph_call(self, node_name):
         """Prepare a graph call for given node."""
-        prompt = self[node_name]['prompt']
-        txt_fmt = {k: v for k, v in self.graph.graph.items() if k != 'api'}
-        prompt = prompt.format(**txt_fmt)
+        prompt = self[node_name]['prompt'].format(**self.txt_fmt)
         self._history.append(node_name)
         return prompt
 
     def _parse_graph_output(self, node0, out):
         """Parse graph output for given node and LLM call output. """
-        successors = list(self.graph.successors(node0))
-        edges = [self[(node0, node1)] for node1 in successors]
-        conditions = [edge.get('condition', None) for edge in edges]
+        successors = self.graph.succ[node0]
 
         if len(successors) == 0:
             logger.info(f'Reached leaf node "{node0}".')
             return out
 
-        if len(successors) > 1 and all(c is None for c in conditions):
+        # prioritize callable conditions, None condition is basically "else"
+        else_node = None
+        for node1, edge in successors.items():
+            condition = edge.get('condition', None)
+            if condition is None:
+                if else_node is None:
+                    else_node = node1
+            elif callable(condition) and condition(out):
+                logger.info(f'Node transition: "{node0}" -> "{node1}" '
+                            '(satisfied by callable condition)')
+                return node1
+
+        edges = list(successors.values())
+        if len(successors) > 1 and all(edge.get('condition', None) is None
+                                       for edge in edges):
             msg = (f'At least one of the edges from "{node0}" should have '
                    f'a "condition": {edges}')
             logger.error(msg)
             raise AttributeError(msg)
 
-        # prioritize callable conditions
-        for i, condition in enumerate(conditions):
-            if callable(condition) and condition(out):
-                logger.info(f'Node transition: "{node0}" -> "{successors[i]}" '
-                            '(satisfied by callable condition)')
-                return successors[i]
-
-        # None condition is basically "else" statement
-        for i, condition in enumerate(conditions):
-            if condition is None:
-                logger.info(f'Node transition: "{node0}" -> "{successors[i]}" '
-                            '(satisfied by None condition)')
-                return successors[i]
+        if else_node is not None:
+            logger.info(f'Node transition: "{node0}" -> "{else_node}" '
+                        '(satisfied by None condition)')
+            return else_node
 
         msg = (f'None of the edge conditions from "{node0}" '
                f'were satisfied: {edges}')
@@ -214,6 +238,7 @@ class DecisionTree:
         """
 
         self._history = []
+        self.invalidate_fmt_cache()
 
         while True:
             try:
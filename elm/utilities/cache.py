@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+ELM persistent LLM response cache
+"""
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Persistent on-disk cache of LLM responses backed by SQLite.
+
+    Deterministic (``temperature=0``) LLM queries return the same answer
+    for the same request, so storing the responses on disk lets repeated
+    runs over the same documents skip the API calls entirely.
+    """
+
+    DEFAULT_TTL = 7 * 24 * 3600
+    """Default time-to-live for cache entries in seconds (one week)"""
+
+    def __init__(self, fp, ttl=DEFAULT_TTL):
+        """
+        Parameters
+        ----------
+        fp : str
+            Filepath to SQLite database file used to store responses. The
+            file (and parent directories) will be created if it does not
+            exist.
+        ttl : int | float | None
+            Default time-to-live for cache entries in seconds. Expired
+            entries are ignored by :meth:`get`. None means entries never
+            expire. Default is one week.
+        """
+        self.fp = fp
+        self.ttl = ttl
+
+        dir_name = os.path.dirname(os.path.abspath(self.fp))
+        os.makedirs(dir_name, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS responses '
+                         '(key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                         'expires REAL)')
+
+    @contextmanager
+    def _connect(self):
+        """Open a connection to the cache database and commit on exit"""
+        conn = sqlite3.connect(self.fp, timeout=30)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def make_key(*parts):
+        """Make a cache key by hashing any number of string parts.
+
+        Parameters
+        ----------
+        *parts : str
+            Strings that together uniquely identify a request (e.g. the
+            model name, prompt version, and the full request text).
+
+        Returns
+        -------
+        str
+            Hex digest to be used as a cache key.
+        """
+        hasher = hashlib.sha256()
+        for part in parts:
+            hasher.update(str(part).encode('utf-8', errors='ignore'))
+            hasher.update(b'\0')
+        return hasher.hexdigest()
+
+    def get(self, key):
+        """Get a cached response.
+
+        Parameters
+        ----------
+        key : str
+            Cache key, typically from :meth:`make_key`.
+
+        Returns
+        -------
+        str | None
+            Cached response, or None if the key is not in the cache or the
+            entry has expired.
+        """
+        with self._connect() as conn:
+            row = conn.execute('SELECT value, expires FROM responses '
+                               'WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+
+        value, expires = row
+        if expires is not None and expires < time.time():
+            return None
+
+        return value
+
+    def put(self, key, value, ttl=None):
+        """Store a response in the cache.
+
+        Parameters
+        ----------
+        key : str
+            Cache key, typically from :meth:`make_key`.
+        value : str
+            Response to store.
+        ttl : int | float | None
+            Optional time-to-live for this entry in seconds. Defaults to the
+            `ttl` given at initialization.
+        """
+        ttl = self.ttl if ttl is None else ttl
+        expires = None if ttl is None else time.time() + ttl
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO responses '
+                         '(key, value, expires) VALUES (?, ?, ?)',
+                         (key, value, expires))
+
+    def clear_expired(self):
+        """Remove all expired entries from the cache database."""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM responses WHERE expires < ?',
+                         (time.time(),))
+
+
+class SemanticResponseCache:
+    """In-memory (optionally persisted) cache of LLM responses keyed by
+    text embeddings.
+
+    Unlike :class:`LLMResponseCache`, lookups succeed for near-duplicate
+    inputs (e.g. re-used paragraphs with small whitespace or wording
+    differences): a cached response is returned if the cosine similarity
+    between the query embedding and a stored embedding exceeds a
+    threshold.
+
+    Entries are partitioned by a `namespace` string. Responses generated
+    with different models or prompts should be stored under different
+    namespaces so that a lookup never returns a response produced for a
+    different request.
+    """
+
+    def __init__(self, fp=None, threshold=0.95):
+        """
+        Parameters
+        ----------
+        fp : str | None
+            Optional filepath (.npz) used to load and save the cache between
+            runs. If the file exists, it is loaded on initialization.
+        threshold : float
+            Cosine similarity threshold that a stored embedding must exceed
+            for its response to be re-used. Default is 0.95.
+        """
+        self.fp = fp
+        self.threshold = threshold
+        self.embeddings = np.zeros((0, 0))
+        self.responses = []
+        self.namespaces = []
+
+        if self.fp is not None and os.path.exists(self.fp):
+            with np.load(self.fp, allow_pickle=False) as data:
+                self.embeddings = data['embeddings']
+                self.responses = data['responses'].tolist()
+                if 'namespaces' in data:
+                    self.namespaces = data['namespaces'].tolist()
+                else:
+                    self.namespaces = [''] * len(self.responses)
+            logger.debug('Loaded {} cached responses from {}'
+                         .format(len(self.responses), self.fp))
+
+    def __len__(self):
+        return len(self.responses)
+
+    @staticmethod
+    def _normalize(embedding):
+        """Convert embedding to a unit-length 1D float array"""
+        embedding = np.asarray(embedding, dtype=float).ravel()
+        norm = np.linalg.norm(embedding)
+        return embedding / norm if norm > 0 else embedding
+
+    def get(self, embedding, namespace=''):
+        """Get the cached response for the most similar stored embedding.
+
+        Parameters
+        ----------
+        embedding : list | np.ndarray
+            1D embedding of the input text.
+        namespace : str
+            Only entries stored under this namespace are considered.
+            Default is an empty string.
+
+        Returns
+        -------
+        str | None
+            Cached response, or None if no stored embedding in the
+            `namespace` has a cosine similarity above the `threshold`.
+        """
+        if namespace not in self.namespaces:
+            return None
+
+        scores = self.embeddings @ self._normalize(embedding)
+        scores[np.asarray(self.namespaces) != namespace] = -np.inf
+        best = int(np.argmax(scores))
+        if scores[best] <= self.threshold:
+            return None
+
+        return self.responses[best]
+
+    def put(self, embedding, response, namespace=''):
+        """Add a response to the cache.
+
+        Parameters
+        ----------
+        embedding : list | np.ndarray
+            1D embedding of the input text.
+        response : str
+            Response to store.
+        namespace : str
+            Namespace to store the response under (see :meth:`get`).
+            Default is an empty string.
+        """
+        embedding = self._normalize(embedding)[np.newaxis, :]
+        if self.responses:
+            self.embeddings = np.vstack([self.embeddings, embedding])
+        else:
+            self.embeddings = embedding
+        self.responses.append(response)
+        self.namespaces.append(namespace)
+
+    def save(self):
+        """Save the cache to `fp` (no-op if `fp` is None)."""
+        if self.fp is None:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.fp)), exist_ok=True)
+        with open(self.fp, 'wb') as f:
+            np.savez(f, embeddings=self.embeddings,
+                     responses=np.array(self.responses, dtype=str),
+                     namespaces=np.array(self.namespaces, dtype=str))
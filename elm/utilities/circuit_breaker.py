@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+ELM circuit breaker utilities
+"""
+import time
+
+
+class CircuitBreaker:
+    """Client-side circuit breaker for calls to an external service.
+
+    The breaker starts "closed" (calls are allowed). After
+    `failure_threshold` consecutive failures it "opens" and calls should
+    fail fast instead of hitting a service that is clearly unavailable.
+    Once `cooldown` seconds have passed, the breaker is "half-open": a
+    single probe call is allowed through. A successful probe closes the
+    breaker again, while a failed probe re-opens it for another
+    cooldown period.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, failure_threshold=5, cooldown=30):
+        """
+        Parameters
+        ----------
+        failure_threshold : int
+            Number of consecutive failures after which the breaker opens.
+            By default, ``5``.
+        cooldown : int | float
+            Number of seconds the breaker stays open before allowing a
+            probe call. By default, ``30``.
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self._opened_at = None
+
+    @property
+    def state(self):
+        """str: Current state of the breaker ("closed", "open", or
+        "half-open")"""
+        if self._opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self._opened_at < self.cooldown:
+            return self.OPEN
+        return self.HALF_OPEN
+
+    def allow(self):
+        """Check whether a call should be attempted.
+
+        In the half-open state, only the first caller is allowed through
+        (as a probe) and the breaker is held open until the probe result
+        is recorded or another cooldown period passes.
+
+        Returns
+        -------
+        bool
+            True if the call should be made, False if it should fail
+            fast.
+        """
+        state = self.state
+        if state == self.HALF_OPEN:
+            self._opened_at = time.monotonic()
+            return True
+        return state == self.CLOSED
+
+    def record_success(self):
+        """Record a successful call (closes the breaker)."""
+        self.failures = 0
+        self._opened_at = None
+
+    def record_failure(self):
+        """Record a failed call (may open the breaker)."""
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self._opened_at = time.monotonic()
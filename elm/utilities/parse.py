@@ -3,6 +3,8 @@
 import io
 import re
 import logging
+import statistics
+from concurrent.futures import ThreadPoolExecutor
 from warnings import warn
 
 import html2text
@@ -11,6 +13,11 @@ import pandas as pd
 
 
 logger = logging.getLogger(__name__)
+_MULTI_DOT_RE = re.compile(r"[.]{4,}")
+_MULTI_NL_RE = re.compile(r"[\n]{3,}")
+_EMPTY_LINE_RE = re.compile(r"[\n\r]+(?:\s*?\d*?\s*)[\n\r]+")
+_HTML_TABLE_RE = re.compile(r"<table>[\s\S]*?</table>")
+_NON_WHITESPACE_RE = re.compile(r"\S")
 
 
 def is_multi_col(text, separator="    ", threshold_ratio=0.35):
@@ -32,11 +39,11 @@ def is_multi_col(text, separator="    ", threshold_ratio=0.35):
     out : bool
         True if more than one vertical text column
     """
-    lines = text.split("\n")
-    total_lines = len(lines)
+    total_lines = text.count("\n") + 1
+    if threshold_ratio > 0 and separator not in text:
+        return False
 
-    gap_lines = [line for line in lines if separator in line.strip()]
-    cols = len(gap_lines)
+    cols = sum(separator in line.strip() for line in text.split("\n"))
 
     ratio = cols / total_lines
 
@@ -57,7 +64,7 @@ def remove_blank_pages(pages):
     list
         List of strings with content, or empty list.
     """
-    return [page for page in pages if any(page.strip())]
+    return [page for page in pages if _NON_WHITESPACE_RE.search(page)]
 
 
 def html_to_text(html, ignore_links=True):
@@ -108,7 +115,7 @@ def format_html_tables(text, **kwargs):
     if not matches:
         return text
 
-    dfs = _find_dfs(text)
+    dfs = _find_dfs(match.group() for match in matches)
     if len(matches) != len(dfs):
         logger.error(
             "Found incompatible number of HTML (%d) and parsed (%d) tables! "
@@ -122,21 +129,37 @@ def format_html_tables(text, **kwargs):
 
 
 def _find_html_table_matches(text):
-    """Find HTML table matches in the text"""
-    return re.findall(r"<table>[\s\S]*?</table>", text)
+    """Find HTML table matches (`re.Match` objects) in the text"""
+    return list(_HTML_TABLE_RE.finditer(text))
 
 
-def _find_dfs(text):
-    """Load HTML tables from text into DataFrames"""
-    return pd.read_html(io.StringIO(text))
+def _find_dfs(matches):
+    """Load HTML tables into DataFrames
+
+    Each table is parsed on its own so that the parsing cost scales
+    with the total size of the tables instead of the size of the
+    document times the number of tables. Tables that cannot be parsed
+    (e.g. empty tables) are skipped.
+    """
+    dfs = []
+    for table_str in matches:
+        try:
+            dfs += pd.read_html(io.StringIO(table_str), flavor="lxml")
+        except ValueError:
+            continue
+    return dfs
 
 
 def _replace_tables_in_text(text, matches, dfs, **kwargs):
     """Replace all items in the 'matches' input with MD tables"""
-    for table_str, df in zip(matches, dfs):
-        new_table_str = df.to_markdown(headers=df.columns, **kwargs)
-        text = text.replace(table_str, new_table_str)
-    return text
+    parts = []
+    last_end = 0
+    for match, df in zip(matches, dfs):
+        parts.append(text[last_end:match.start()])
+        parts.append(df.to_markdown(headers=df.columns, **kwargs))
+        last_end = match.end()
+    parts.append(text[last_end:])
+    return "".join(parts)
 
 
 def clean_headers(
@@ -149,7 +172,8 @@ def clean_headers(
     """Clean headers/footers that are duplicated across pages of a document.
 
     Note that this function will update the items within the `pages`
-    input.
+    input. Documents with fewer than three pages are returned as-is,
+    since headers cannot be reliably told apart from content.
 
     Parameters
     ----------
@@ -174,34 +198,20 @@ def clean_headers(
         Clean text with all pages joined
     """
     logger.info("Cleaning headers")
-    headers = _get_nominal_headers(pages, split_on, iheaders)
-    tests = np.zeros((len(pages), len(headers)))
-
-    for ip, page in enumerate(pages):
-        for ih, header in zip(iheaders, headers):
-            pheader = ""
-            try:
-                pheader = page.split(split_on)[ih]
-            except IndexError:
-                pass
-
-            harr = header.replace(" ", "")
-            parr = pheader.replace(" ", "")
-
-            harr = harr.ljust(len(parr))
-            parr = parr.ljust(len(harr))
+    if len(pages) < 3:
+        logger.debug("Too few pages to detect headers; skipping")
+        return pages
 
-            harr = np.array([*harr])
-            parr = np.array([*parr])
-            assert len(harr) == len(parr)
+    headers = _get_nominal_headers(pages, split_on, iheaders)
+    if not any(headers):
+        return pages
 
-            test = harr == parr
-            if len(test) == 0:
-                test = 1.0
-            else:
-                test = test.sum() / len(test)
+    page_lines = [page.split(split_on) for page in pages]
+    tests = np.zeros((len(pages), len(headers)))
 
-            tests[ip, ih] = test
+    for ih, header in zip(iheaders, headers):
+        page_headers = [_line_or_empty(lines, ih) for lines in page_lines]
+        tests[:, ih] = _header_match_fractions(header, page_headers)
 
     logger.debug("Header tests (page, iheader): \n{}".format(tests))
     tests = (tests > char_thresh).sum(axis=0) / len(pages)
@@ -214,22 +224,61 @@ def clean_headers(
     if not header_inds_to_remove:
         return pages
 
-    for ip, page in enumerate(pages):
-        page = page.split(split_on)
+    pos_inds = {ind for ind in header_inds_to_remove if ind >= 0}
+    neg_inds = {ind for ind in header_inds_to_remove if ind < 0}
+    for ip, page in enumerate(page_lines):
         if len(iheaders) >= len(page):
             continue
+        remove = pos_inds | {len(page) + ind for ind in neg_inds}
         pages[ip] = split_on.join(
             [
                 line
                 for line_ind, line in enumerate(page)
-                if line_ind not in header_inds_to_remove
-                and line_ind - len(page) not in header_inds_to_remove
+                if line_ind not in remove
             ]
         )
 
     return pages
 
 
+def _line_or_empty(lines, ind):
+    """Get a line by index, or an empty string if it does not exist."""
+    try:
+        return lines[ind]
+    except IndexError:
+        return ""
+
+
+def _header_match_fractions(header, page_headers):
+    """Fraction of matching characters between a header and page headers.
+
+    Spaces are ignored. Characters are compared position by position,
+    and the number of matches is divided by the length of the longer of
+    the two strings (empty pairs count as a full match). All page
+    headers are compared at once using a padded array of code points.
+    """
+    header = header.replace(" ", "")
+    page_headers = [line.replace(" ", "") for line in page_headers]
+
+    pair_lens = np.maximum([len(line) for line in page_headers], len(header))
+    width = int(pair_lens.max(initial=0))
+
+    # use distinct (invalid code point) pad values so padding never matches
+    header_codes = np.full(width, 0xFFFFFFFF, dtype=np.uint32)
+    header_codes[: len(header)] = _code_points(header)
+    page_codes = np.full((len(page_headers), width), 0xFFFFFFFE, np.uint32)
+    for ind, line in enumerate(page_headers):
+        page_codes[ind, : len(line)] = _code_points(line)
+
+    matches = (page_codes == header_codes).sum(axis=1)
+    return np.where(pair_lens > 0, matches / np.maximum(pair_lens, 1), 1.0)
+
+
+def _code_points(text):
+    """Array of unicode code points for a string."""
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
 def _get_nominal_headers(pages, split_on, iheaders):
     """Get nominal headers from a standard page.
 
@@ -254,13 +303,15 @@ def _get_nominal_headers(pages, split_on, iheaders):
     """
 
     headers = [None] * len(iheaders)
-    page_lens = np.array([len(p) for p in pages])
-    median_len = np.median(page_lens)
-    ipage = np.argmin(np.abs(page_lens - median_len))
-    page = pages[ipage]
+    page_lens = [len(p) for p in pages]
+    median_len = statistics.median(page_lens)
+    ipage = min(
+        range(len(pages)), key=lambda ind: abs(page_lens[ind] - median_len)
+    )
+    lines = pages[ipage].split(split_on)
     for i, ih in enumerate(iheaders):
         try:
-            header = page.split(split_on)[ih]
+            header = lines[ih]
         except IndexError:
             header = ""
         headers[i] = header
@@ -315,7 +366,7 @@ def replace_multi_dot_lines(text):
     str
         Cleaned text with only three dots max in a row.
     """
-    return re.sub(r"[.]{3,}", "...", text)
+    return _MULTI_DOT_RE.sub("...", text)
 
 
 def replace_excessive_newlines(text):
@@ -331,7 +382,7 @@ def replace_excessive_newlines(text):
     str
         Cleaned text with only a maximum of two newlines in a row.
     """
-    return re.sub(r"[\n]{3,}", "\n\n", text)
+    return _MULTI_NL_RE.sub("\n\n", text)
 
 
 def remove_empty_lines_or_page_footers(text):
@@ -348,7 +399,7 @@ def remove_empty_lines_or_page_footers(text):
     str
         Cleaned text with no empty lines.
     """
-    return re.sub(r"[\n\r]+(?:\s*?\d*?\s*)[\n\r]+", "\n", text)
+    return _EMPTY_LINE_RE.sub("\n", text)
 
 
 def read_pdf(pdf_bytes, verbose=True):
@@ -391,13 +442,16 @@ def _load_pdf_possibly_multi_col(pdf_bytes):
     import pdftotext
 
     pdf_bytes = io.BytesIO(pdf_bytes)
-    pages = pdftotext.PDF(pdf_bytes, physical=True)
+    # extract the page text once; the same pages are used for the column
+    # check and returned to the caller
+    pages = list(pdftotext.PDF(pdf_bytes, physical=True))
     if is_multi_col(combine_pages(pages)):
-        pages = pdftotext.PDF(pdf_bytes, physical=False)
+        pdf_bytes.seek(0)
+        pages = list(pdftotext.PDF(pdf_bytes, physical=False))
     return pages
 
 
-def read_pdf_ocr(pdf_bytes, verbose=True):  # pragma: no cover
+def read_pdf_ocr(pdf_bytes, verbose=True, max_workers=1):  # pragma: no cover
     """Read PDF contents from bytes using Optical Character recognition (OCR).
 
     This method attempt to read the PDF document using OCR. This is one
@@ -419,6 +473,11 @@ def read_pdf_ocr(pdf_bytes, verbose=True):  # pragma: no cover
         Bytes corresponding to a PDF file.
     verbose : bool, optional
         Option to log errors during parsing. By default, ``True``.
+    max_workers : int, optional
+        Number of pages to OCR concurrently. Each page runs in its own
+        tesseract subprocess (which may itself be multithreaded), so
+        keep this at ``1`` when calling this function from a process
+        pool. By default, ``1``.
 
     Returns
     -------
@@ -427,7 +486,7 @@ def read_pdf_ocr(pdf_bytes, verbose=True):  # pragma: no cover
         may be empty if there was an error reading the PDF file.
     """
     try:
-        pages = _load_pdf_with_pytesseract(pdf_bytes)
+        pages = _load_pdf_with_pytesseract(pdf_bytes, max_workers)
     except Exception as e:
         if verbose:
             logger.error("Failed to decode PDF content!")
@@ -437,7 +496,7 @@ def read_pdf_ocr(pdf_bytes, verbose=True):  # pragma: no cover
     return pages
 
 
-def _load_pdf_with_pytesseract(pdf_bytes):  # pragma: no cover
+def _load_pdf_with_pytesseract(pdf_bytes, max_workers=1):  # pragma: no cover
     """Load PDF bytes using Optical Character recognition (OCR)"""
 
     try:
@@ -469,7 +528,11 @@ def _load_pdf_with_pytesseract(pdf_bytes):  # pragma: no cover
         pytesseract.pytesseract.tesseract_cmd,
     )
 
-    return [
-        str(pytesseract.image_to_string(page_data).encode("utf-8"))
-        for page_data in convert_from_bytes(bytes(pdf_bytes))
-    ]
+    images = convert_from_bytes(bytes(pdf_bytes))
+    if max_workers <= 1:
+        return [pytesseract.image_to_string(image) for image in images]
+
+    # tesseract runs as a subprocess, so pages can be OCR'd concurrently
+    # from threads
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(pytesseract.image_to_string, images))
@@ -20,6 +20,9 @@ def retry_with_exponential_backoff(
     jitter=True,
     max_retries=3,
     errors=(openai.RateLimitError, openai.APITimeoutError),
+    max_delay=60,
+    circuit_breaker=None,
+    max_timeout=None,
 ):
     """Retry a synchronous function with exponential backoff.
 
@@ -42,12 +45,14 @@ def retry_with_exponential_backoff(
         The multiplication factor applied to the base `delay` input.
         See description of `delay` for an example. By default, ``4``.
     jitter : bool, optional
-        Option to include a random fractional adder (0 - 1) to the
-        `exponential_base` before multiplying by the `delay`. This can
-        help ensure each function call is submitted slightly offset from
-        other calls in a batch and therefore help avoid repeated rate
-        limit failures by a batch of submissions arriving simultaneously
-        to a service. By default, ``True``.
+        Option to use "decorrelated jitter": instead of the full
+        exponential delay, each retry waits a random time between
+        `base_delay` and the previous delay multiplied by the
+        `exponential_base`. This helps ensure each function call is
+        submitted offset from other calls in a batch and therefore
+        helps avoid repeated rate limit failures by a batch of
+        submissions arriving simultaneously to a service.
+        By default, ``True``.
     max_retries : int, optional
         Max number of retries before raising an `ELMRuntimeError`.
         By default, ``3``.
@@ -55,6 +60,20 @@ def retry_with_exponential_backoff(
         The error class(es) to signal a retry. Other errors will be
         propagated without retrying.
         By default, ``(openai.RateLimitError, openai.APITimeoutError)``.
+    max_delay : int | float, optional
+        Maximum delay time between retries, in seconds.
+        By default, ``60``.
+    circuit_breaker : elm.utilities.circuit_breaker.CircuitBreaker, optional
+        Optional circuit breaker shared between calls. Every failed
+        attempt (one of the `errors`) is recorded on the breaker, and
+        once it opens, calls fail fast with an `ELMRuntimeError` instead
+        of querying the service until the breaker cooldown has passed.
+        By default, ``None``.
+    max_timeout : int | float, optional
+        If the decorated function is called with a ``timeout`` keyword
+        argument, it is doubled before every retry. This value caps the
+        doubled timeout, in seconds. ``None`` means no cap.
+        By default, ``None``.
 
     References
     ----------
@@ -69,16 +88,23 @@ def retry_with_exponential_backoff(
             delay = base_delay
 
             while True:
+                _check_circuit_breaker(circuit_breaker)
                 try:
-                    return func(*args, **kwargs)
+                    out = func(*args, **kwargs)
                 except errors as e:
+                    _record_failure(circuit_breaker)
                     num_retries = _handle_retries(num_retries, max_retries, e)
-                    delay = _compute_delay(delay, exponential_base, jitter)
+                    delay = _compute_delay(
+                        delay, base_delay, exponential_base, max_delay, jitter
+                    )
                     logger.info(
-                        "Error: %s. Retrying in %.2f seconds.", str(e), delay
+                        "Error: %s. Retrying in %.2f seconds.", e, delay
                     )
-                    kwargs = _double_timeout(**kwargs)
+                    kwargs = _double_timeout(kwargs, max_timeout)
                     time.sleep(delay)
+                else:
+                    _record_success(circuit_breaker)
+                    return out
 
         return wrapper
 
@@ -91,6 +117,9 @@ def async_retry_with_exponential_backoff(
     jitter=True,
     max_retries=3,
     errors=(openai.RateLimitError, openai.APITimeoutError),
+    max_delay=60,
+    circuit_breaker=None,
+    max_timeout=None,
 ):
     """Retry an asynchronous function with exponential backoff.
 
@@ -113,12 +142,14 @@ def async_retry_with_exponential_backoff(
         The multiplication factor applied to the base `delay` input.
         See description of `delay` for an example. By default, ``4``.
     jitter : bool, optional
-        Option to include a random fractional adder (0 - 1) to the
-        `exponential_base` before multiplying by the `delay`. This can
-        help ensure each function call is submitted slightly offset from
-        other calls in a batch and therefore help avoid repeated rate
-        limit failures by a batch of submissions arriving simultaneously
-        to a service. By default, ``True``.
+        Option to use "decorrelated jitter": instead of the full
+        exponential delay, each retry waits a random time between
+        `base_delay` and the previous delay multiplied by the
+        `exponential_base`. This helps ensure each function call is
+        submitted offset from other calls in a batch and therefore
+        helps avoid repeated rate limit failures by a batch of
+        submissions arriving simultaneously to a service.
+        By default, ``True``.
     max_retries : int, optional
         Max number of retries before raising an `ELMRuntimeError`.
         By default, ``3``.
@@ -126,6 +157,20 @@ def async_retry_with_exponential_backoff(
         The error class(es) to signal a retry. Other errors will be
         propagated without retrying.
         By default, ``(openai.RateLimitError, openai.APITimeoutError)``.
+    max_delay : int | float, optional
+        Maximum delay time between retries, in seconds.
+        By default, ``60``.
+    circuit_breaker : elm.utilities.circuit_breaker.CircuitBreaker, optional
+        Optional circuit breaker shared between calls. Every failed
+        attempt (one of the `errors`) is recorded on the breaker, and
+        once it opens, calls fail fast with an `ELMRuntimeError` instead
+        of querying the service until the breaker cooldown has passed.
+        By default, ``None``.
+    max_timeout : int | float, optional
+        If the decorated function is called with a ``timeout`` keyword
+        argument, it is doubled before every retry. This value caps the
+        doubled timeout, in seconds. ``None`` means no cap.
+        By default, ``None``.
 
     References
     ----------
@@ -140,22 +185,52 @@ def async_retry_with_exponential_backoff(
             delay = base_delay
 
             while True:
+                _check_circuit_breaker(circuit_breaker)
                 try:
-                    return await func(*args, **kwargs)
+                    out = await func(*args, **kwargs)
                 except errors as e:
+                    _record_failure(circuit_breaker)
                     num_retries = _handle_retries(num_retries, max_retries, e)
-                    delay = _compute_delay(delay, exponential_base, jitter)
+                    delay = _compute_delay(
+                        delay, base_delay, exponential_base, max_delay, jitter
+                    )
                     logger.info(
-                        "Error: %s. Retrying in %.2f seconds.", str(e), delay
+                        "Error: %s. Retrying in %.2f seconds.", e, delay
                     )
-                    kwargs = _double_timeout(**kwargs)
+                    kwargs = _double_timeout(kwargs, max_timeout)
                     await asyncio.sleep(delay)
+                else:
+                    _record_success(circuit_breaker)
+                    return out
 
         return wrapper
 
     return decorator
 
 
+def _check_circuit_breaker(circuit_breaker):
+    """Raise error if the circuit breaker does not allow calls"""
+    if circuit_breaker is None or circuit_breaker.allow():
+        return
+    msg = (
+        "Circuit breaker is open after {} consecutive failures; not "
+        "attempting call".format(circuit_breaker.failures)
+    )
+    raise ELMRuntimeError(msg)
+
+
+def _record_failure(circuit_breaker):
+    """Record failed call on the circuit breaker (if any)"""
+    if circuit_breaker is not None:
+        circuit_breaker.record_failure()
+
+
+def _record_success(circuit_breaker):
+    """Record successful call on the circuit breaker (if any)"""
+    if circuit_breaker is not None:
+        circuit_breaker.record_success()
+
+
 def _handle_retries(num_retries, max_retries, error):
     """Raise error if retry attempts exceed max limit"""
     num_retries += 1
@@ -165,22 +240,30 @@ def _handle_retries(num_retries, max_retries, error):
     return num_retries
 
 
-def _compute_delay(delay, exponential_base, jitter):
-    """Compute the next delay time"""
-    return delay * exponential_base * (1 + jitter * random.random())
+def _compute_delay(delay, base_delay, exponential_base, max_delay, jitter):
+    """Compute the next delay time (decorrelated jitter, capped)"""
+    max_next_delay = delay * exponential_base
+    if jitter:
+        max_next_delay = random.uniform(base_delay, max_next_delay)
+    return min(max_delay, max_next_delay)
 
 
-def _double_timeout(**kwargs):
-    """Double timeout parameter if it exists in kwargs."""
+def _double_timeout(kwargs, max_timeout=None):
+    """Double timeout parameter (up to a cap) if it exists in kwargs."""
     if "timeout" not in kwargs:
         return kwargs
 
     prev_timeout = kwargs["timeout"]
+    new_timeout = prev_timeout * 2
+    if max_timeout is not None:
+        new_timeout = min(max_timeout, new_timeout)
+    if new_timeout == prev_timeout:
+        return kwargs
+
     logger.info(
         "Detected 'timeout' key in kwargs. Doubling this input from "
         "%.2f to %.2f for next iteration.",
         prev_timeout,
-        prev_timeout * 2,
+        new_timeout,
     )
-    kwargs["timeout"] = prev_timeout * 2
-    return kwargs
+    return {**kwargs, "timeout": new_timeout}
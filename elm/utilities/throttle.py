@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""
+ELM API request throttling utilities
+"""
+import asyncio
+import time
+
+
+class AsyncTokenBucket:
+    """Token bucket rate limiter for async API requests.
+
+    The bucket refills continuously at a fixed rate up to a maximum
+    capacity. Requests consume tokens before they are sent, so the
+    request rate is kept under the API limit pro-actively instead of
+    relying on rate limit errors and retries.
+    """
+
+    def __init__(self, rate, capacity):
+        """
+        Parameters
+        ----------
+        rate : float
+            Refill rate of the bucket in tokens per second.
+        capacity : float
+            Maximum number of tokens the bucket can hold. The bucket
+            starts full.
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+
+    @property
+    def tokens(self):
+        """float: Number of tokens currently available in the bucket"""
+        self._refill()
+        return self._tokens
+
+    def _refill(self):
+        """Add tokens accumulated since the last refill"""
+        now = time.monotonic()
+        elapsed = now - self._last_refill
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def try_acquire(self, tokens):
+        """Take tokens from the bucket if enough are available.
+
+        Parameters
+        ----------
+        tokens : float
+            Number of tokens required by the request.
+
+        Returns
+        -------
+        bool
+            True if the tokens were taken from the bucket, False if there
+            are not enough tokens available (the bucket is unchanged).
+        """
+        self._refill()
+        if tokens > self._tokens:
+            return False
+        self._tokens -= tokens
+        return True
+
+    def wait_time(self, tokens):
+        """Get the number of seconds until the requested tokens are available.
+
+        Parameters
+        ----------
+        tokens : float
+            Number of tokens required by the request.
+
+        Returns
+        -------
+        float
+            Seconds to wait before :meth:`try_acquire` can succeed. Zero if
+            the tokens are available now.
+        """
+        missing = tokens - self.tokens
+        return max(0, missing / self.rate)
+
+    async def acquire(self, tokens):
+        """Wait until enough tokens are available and take them.
+
+        Parameters
+        ----------
+        tokens : float
+            Number of tokens required by the request. Must not exceed the
+            bucket capacity.
+        """
+        if tokens > self.capacity:
+            msg = ('Cannot acquire {} tokens from a bucket with a capacity '
+                   'of {}!'.format(tokens, self.capacity))
+            raise ValueError(msg)
+
+        while not self.try_acquire(tokens):
+            await asyncio.sleep(self.wait_time(tokens))
+
+
+class AdaptiveTokenBucket(AsyncTokenBucket):
+    """Token bucket whose refill rate adapts to API rate limit responses.
+
+    The refill rate follows an additive-increase/multiplicative-decrease
+    (AIMD) scheme: every successful request increases the rate by a
+    fixed increment (up to the initial rate), and every rate limit error
+    multiplies the rate by a decrease factor (down to a minimum rate).
+    This lets the request rate converge on the actual server quota
+    instead of repeatedly overshooting it and waiting for retries.
+    """
+
+    def __init__(self, rate, capacity, min_rate=None, increase=None,
+                 decrease=0.5):
+        """
+        Parameters
+        ----------
+        rate : float
+            Initial (and maximum) refill rate of the bucket in tokens per
+            second.
+        capacity : float
+            Maximum number of tokens the bucket can hold. The bucket
+            starts full.
+        min_rate : float, optional
+            Minimum refill rate in tokens per second. If None, defaults to
+            10% of the initial `rate`.
+        increase : float, optional
+            Rate increment (tokens per second) applied after every
+            successful request. If None, defaults to 1% of the initial
+            `rate`.
+        decrease : float
+            Multiplicative factor applied to the rate after a rate limit
+            error. Default is 0.5.
+        """
+        super().__init__(rate, capacity)
+        self.max_rate = rate
+        self.min_rate = rate / 10 if min_rate is None else min_rate
+        self.increase = rate / 100 if increase is None else increase
+        self.decrease = decrease
+
+    def on_success(self):
+        """Increase the refill rate after a successful request."""
+        self._refill()
+        self.rate = min(self.max_rate, self.rate + self.increase)
+
+    def on_failure(self):
+        """Decrease the refill rate after a rate limit error."""
+        self._refill()
+        self.rate = max(self.min_rate, self.rate * self.decrease)
@@ -1,15 +1,20 @@
 """ELM import utility."""
 import importlib
 import logging
+from functools import lru_cache
 from warnings import warn
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=None)
 def try_import(package_name):
     """Function to import packages needed for
     postgres and aws.
 
+    Results are cached, so repeated calls for the same package are cheap
+    and the warning for a missing package is only emitted once.
+
     Parameters
     ----------
     package_name : str
@@ -17,8 +22,8 @@ def try_import(package_name):
 
     Returns
     -------
-    p : module
-        imported package.
+    p : module | None
+        imported package, or None if the package could not be imported.
     """
     try:
         p = importlib.import_module(package_name)
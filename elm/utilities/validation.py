@@ -18,7 +18,7 @@ def validate_azure_api_params(azure_api_key=None, azure_version=None,
             - AZURE_OPENAI_ENDPOINT
 
         If any of these are still `None` after reading from the
-        environment, an error is raised.
+        environment, a ``ValueError`` is raised.
 
     Returns
     -------
@@ -29,7 +29,10 @@ def validate_azure_api_params(azure_api_key=None, azure_version=None,
     azure_api_key = azure_api_key or os.environ.get("AZURE_OPENAI_API_KEY")
     azure_version = azure_version or os.environ.get("AZURE_OPENAI_VERSION")
     azure_endpoint = azure_endpoint or os.environ.get("AZURE_OPENAI_ENDPOINT")
-    assert azure_api_key is not None, "Must set AZURE_OPENAI_API_KEY!"
-    assert azure_version is not None, "Must set AZURE_OPENAI_VERSION!"
-    assert azure_endpoint is not None, "Must set AZURE_OPENAI_ENDPOINT!"
+    required = [("AZURE_OPENAI_API_KEY", azure_api_key),
+                ("AZURE_OPENAI_VERSION", azure_version),
+                ("AZURE_OPENAI_ENDPOINT", azure_endpoint)]
+    for name, value in required:
+        if value is None:
+            raise ValueError("Must set {}!".format(name))
     return azure_api_key, azure_version, azure_endpoint
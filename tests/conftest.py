@@ -1,6 +1,8 @@
 # -*- coding: utf-8 -*-
 """Fixtures for use across all tests."""
 import asyncio
+import json
+from types import SimpleNamespace
 
 import pytest
 from openai.types import Completion, CompletionUsage, CompletionChoice
@@ -107,3 +109,114 @@ def sample_openai_response():
         return llm_response
 
     return _get_response
+
+
+@pytest.fixture
+def batch_openai_client():
+    """Mock OpenAI client class that supports the Batch API"""
+
+    class MockBatchClient:
+        """Mock of the OpenAI client files/batches API for testing"""
+
+        def __init__(self, respond, fail=None, num_polls_to_finish=2):
+            """
+
+            Parameters
+            ----------
+            respond : callable
+                Function that takes a request body and returns the
+                response message content.
+            fail : callable, optional
+                Function that takes a request body and returns ``True``
+                if that request should fail. By default, ``None``.
+            num_polls_to_finish : int, optional
+                Number of status checks before the batch completes. If
+                ``None``, the batch never completes. By default, ``2``.
+            """
+            self.respond = respond
+            self.fail = fail or (lambda body: False)
+            self.num_polls_to_finish = num_polls_to_finish
+            self.uploaded = []
+            self.cancelled = []
+            self.num_polls = 0
+            self.files = SimpleNamespace(
+                create=self._create_file, content=self._file_content
+            )
+            self.batches = SimpleNamespace(
+                create=self._create_batch,
+                retrieve=self._retrieve_batch,
+                cancel=self._cancel_batch,
+            )
+
+        async def _create_file(self, file, purpose):
+            assert purpose == "batch"
+            self.uploaded.append(
+                [json.loads(line) for line in file[1].splitlines()]
+            )
+            return SimpleNamespace(id="input-file")
+
+        async def _create_batch(
+            self, input_file_id, endpoint, completion_window
+        ):
+            assert input_file_id == "input-file"
+            return SimpleNamespace(
+                id="batch", status="validating", output_file_id=None
+            )
+
+        async def _retrieve_batch(self, batch_id):
+            self.num_polls += 1
+            if (
+                self.num_polls_to_finish is None
+                or self.num_polls < self.num_polls_to_finish
+            ):
+                return SimpleNamespace(
+                    id=batch_id, status="in_progress", output_file_id=None
+                )
+            return SimpleNamespace(
+                id=batch_id, status="completed", output_file_id="output-file"
+            )
+
+        async def _cancel_batch(self, batch_id):
+            self.cancelled.append(batch_id)
+
+        async def _file_content(self, file_id):
+            assert file_id == "output-file"
+            lines = []
+            for request in reversed(self.uploaded[-1]):
+                if self.fail(request["body"]):
+                    response = {"status_code": 500, "body": {}}
+                else:
+                    response = {
+                        "status_code": 200,
+                        "body": _chat_completion_body(
+                            self.respond(request["body"])
+                        ),
+                    }
+                result = {"custom_id": request["custom_id"]}
+                result["response"] = response
+                lines.append(json.dumps(result))
+            return SimpleNamespace(text="\n".join(lines))
+
+    return MockBatchClient
+
+
+def _chat_completion_body(content):
+    """Minimal chat completion response body"""
+    return {
+        "id": "1",
+        "object": "chat.completion",
+        "created": 0,
+        "model": "gpt-4",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": content},
+            }
+        ],
+        "usage": {
+            "prompt_tokens": 10,
+            "completion_tokens": 1,
+            "total_tokens": 11,
+        },
+    }
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Test ELM Ordinance extraction apply functions"""
+import asyncio
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+import elm.ords.extraction.apply
+from elm.ords.extraction.apply import _extract_date
+from elm.web.document import HTMLDocument
+
+
+class MockDateExtractor:
+    """Mock date extractor that counts the number of parse calls"""
+
+    calls = 0
+    fail = False
+
+    def __init__(self, structured_llm_caller):
+        self.slc = structured_llm_caller
+
+    async def parse(self, doc):
+        """Mock parse"""
+        MockDateExtractor.calls += 1
+        await asyncio.sleep(0)
+        if MockDateExtractor.fail:
+            raise asyncio.CancelledError
+        return 2024, 1, 1
+
+
+def test_extract_date_cache(monkeypatch):
+    """Test that dates are re-used for identical documents across runs"""
+    monkeypatch.setattr(
+        elm.ords.extraction.apply, "DateExtractor", MockDateExtractor
+    )
+    monkeypatch.setattr(elm.ords.extraction.apply, "_DATE_CACHE", {})
+    MockDateExtractor.calls = 0
+    llm_caller = SimpleNamespace(kwargs={"model": "gpt-4"})
+
+    MockDateExtractor.fail = True
+    with pytest.raises(asyncio.CancelledError):
+        asyncio.run(_extract_date(HTMLDocument(["Ord text"]), llm_caller))
+    assert MockDateExtractor.calls == 1
+
+    MockDateExtractor.fail = False
+    date = asyncio.run(_extract_date(HTMLDocument(["Ord text"]), llm_caller))
+    assert date == (2024, 1, 1)
+    assert MockDateExtractor.calls == 2
+
+    date = asyncio.run(_extract_date(HTMLDocument(["Ord text"]), llm_caller))
+    assert date == (2024, 1, 1)
+    assert MockDateExtractor.calls == 2
+
+    asyncio.run(_extract_date(HTMLDocument(["Other text"]), llm_caller))
+    assert MockDateExtractor.calls == 3
+
+    llm_caller = SimpleNamespace(kwargs={"model": "gpt-4o"})
+    asyncio.run(_extract_date(HTMLDocument(["Ord text"]), llm_caller))
+    assert MockDateExtractor.calls == 4
+
+
+if __name__ == "__main__":
+    pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""Test ELM Ordinance decision tree graph setup functions"""
+from pathlib import Path
+
+import networkx as nx
+import pytest
+
+from elm.ords.extraction.graphs import (
+    setup_graph_wes_types,
+    setup_base_graph,
+    setup_participating_owner,
+    setup_multiplier,
+    setup_conditional,
+    setup_graph_extra_restriction,
+    llm_response_starts_with_yes,
+    llm_response_starts_with_no,
+    llm_response_does_not_start_with_no,
+)
+
+
+@pytest.mark.parametrize(
+    "graph_setup_func",
+    [
+        setup_graph_wes_types,
+        setup_base_graph,
+        setup_participating_owner,
+        setup_multiplier,
+        setup_conditional,
+        setup_graph_extra_restriction,
+    ],
+)
+def test_graph_structure(graph_setup_func):
+    """Test that every node has a prompt and is reachable from 'init'"""
+    G = graph_setup_func(feature="roads")
+
+    assert G.graph["feature"] == "roads"
+    assert "SECTION_PROMPT" in G.graph
+    assert "COMMENT_PROMPT" in G.graph
+
+    # a typo in an edge would create a node without a prompt
+    assert all("prompt" in node for __, node in G.nodes(data=True))
+    assert set(nx.descendants(G, "init")) | {"init"} == set(G.nodes)
+
+
+@pytest.mark.parametrize(
+    "response, yes, no",
+    [
+        ("Yes, the text mentions it.", True, False),
+        ("YES", True, False),
+        ("No, it does not.", False, True),
+        ("no", False, True),
+        ("Ye", False, False),
+        ("", False, False),
+    ],
+)
+def test_llm_response_starts_with(response, yes, no):
+    """Test the yes/no LLM response conditions"""
+    assert llm_response_starts_with_yes(response) is yes
+    assert llm_response_starts_with_no(response) is no
+    assert llm_response_does_not_start_with_no(response) is not no
+
+
+if __name__ == "__main__":
+    pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
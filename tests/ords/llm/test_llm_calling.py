@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+# pylint: disable=unused-argument
+"""Test ELM Ordinances LLM Calling classes"""
+from pathlib import Path
+
+import pytest
+
+from elm.ords.llm import LLMCaller, StructuredLLMCaller
+
+
+class MockService:
+    """Mock LLM service that records the messages it receives"""
+
+    def __init__(self, response):
+        self.response = response
+        self.seen = []
+
+    async def call(self, *args, messages, **kwargs):
+        """Record a copy of the messages and return the set response"""
+        self.seen.append([dict(message) for message in messages])
+        return self.response
+
+
+@pytest.mark.asyncio
+async def test_llm_caller_messages():
+    """Test that `LLMCaller` sends the correct (pooled) messages"""
+
+    service = MockService("test response")
+    caller = LLMCaller(service)
+
+    assert await caller.call("sys 1", "content 1") == "test response"
+    assert await caller.call("sys 2", "content 2") == "test response"
+
+    assert service.seen == [
+        [
+            {"role": "system", "content": "sys 1"},
+            {"role": "user", "content": "content 1"},
+        ],
+        [
+            {"role": "system", "content": "sys 2"},
+            {"role": "user", "content": "content 2"},
+        ],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_structured_llm_caller():
+    """Test `StructuredLLMCaller` basic execution"""
+
+    service = MockService('```json\n{"a": True, "b": 1}\n```')
+    caller = StructuredLLMCaller(service)
+
+    out = await caller.call("Return your answer in JSON format", "content")
+    assert out == {"a": True, "b": 1}
+    assert service.seen[-1][0]["content"] == (
+        "Return your answer in JSON format"
+    )
+
+    out = await caller.call("Extract data", "content")
+    assert out == {"a": True, "b": 1}
+    assert service.seen[-1][0]["content"] == (
+        "Extract data Return your answer in JSON format."
+    )
+
+    service.response = None
+    assert await caller.call("Extract data", "content") == {}
+
+
+if __name__ == "__main__":
+    pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
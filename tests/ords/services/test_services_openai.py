@@ -10,6 +10,7 @@ import openai
 from elm.ords.services.openai import (
     count_tokens,
     usage_from_response,
+    batch_chat_completions,
     OpenAIService,
 )
 from elm.ords.services.usage import UsageTracker
@@ -115,5 +116,61 @@ async def test_openai_service(sample_openai_response, monkeypatch):
     }
 
 
+@pytest.mark.asyncio
+async def test_batch_chat_completions(batch_openai_client):
+    """Test running chat completions through the (mock) Batch API"""
+
+    def respond(body):
+        return body["messages"][-1]["content"].upper()
+
+    def fail(body):
+        return body["messages"][-1]["content"] == "b"
+
+    client = batch_openai_client(respond)
+    assert await batch_chat_completions(client, []) == []
+    assert not client.uploaded
+
+    client = batch_openai_client(respond, fail=fail)
+    requests = [
+        {"model": "gpt-4", "messages": [{"role": "user", "content": "a"}]},
+        {"model": "gpt-4", "messages": [{"role": "user", "content": "b"}]},
+        {"model": "gpt-4", "messages": [{"role": "user", "content": "c"}]},
+    ]
+    out = await batch_chat_completions(client, requests, poll_interval=0)
+
+    assert client.num_polls == 2
+    assert not client.cancelled
+    uploaded = client.uploaded[0]
+    assert [r["custom_id"] for r in uploaded] == ["0", "1", "2"]
+    assert all(r["url"] == "/v1/chat/completions" for r in uploaded)
+    assert [r["body"] for r in uploaded] == requests
+
+    assert out[0].choices[0].message.content == "A"
+    assert out[1] is None
+    assert out[2].choices[0].message.content == "C"
+    assert usage_from_response({}, out[0]) == {
+        "requests": 1,
+        "prompt_tokens": 10,
+        "response_tokens": 1,
+    }
+
+
+@pytest.mark.asyncio
+async def test_batch_chat_completions_max_wait(batch_openai_client):
+    """Test that a batch that does not finish in time is cancelled"""
+    client = batch_openai_client(lambda body: "", num_polls_to_finish=None)
+    requests = [
+        {"model": "gpt-4", "messages": [{"role": "user", "content": "a"}]},
+        {"model": "gpt-4", "messages": [{"role": "user", "content": "b"}]},
+    ]
+    out = await batch_chat_completions(
+        client, requests, poll_interval=0.01, max_wait=0.05
+    )
+
+    assert out == [None, None]
+    assert client.num_polls >= 1
+    assert client.cancelled == ["batch"]
+
+
 if __name__ == "__main__":
     pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
@@ -144,6 +144,33 @@ async def test_services_provider_no_submissions_allowed_at_start(
     assert job_order == expected_job_order, f"{job_order=}"
 
 
+@pytest.mark.asyncio
+async def test_services_provider_skips_cancelled_calls(service_base_class):
+    """Test that services provider skips calls that were cancelled."""
+
+    job_order, TestService = service_base_class
+
+    class AlwaysOneService(TestService):
+        NUMBER = 1
+        LEN_SLEEP = 1
+
+    services = [AlwaysOneService()]
+    async with RunningAsyncServices(services):
+        producers = [
+            asyncio.create_task(AlwaysOneService.call(i)) for i in range(4)
+        ]
+        await asyncio.sleep(0.5)
+        producers[0].cancel()
+        producers[2].cancel()
+        out = await asyncio.gather(*producers, return_exceptions=True)
+
+    assert isinstance(out[0], asyncio.CancelledError)
+    assert out[1] == 1
+    assert isinstance(out[2], asyncio.CancelledError)
+    assert out[3] == 1
+    assert job_order == [(1, 0), (1, 1), (1, 3)], f"{job_order=}"
+
+
 @pytest.mark.asyncio
 async def test_services_provider_raises_error():
     """Test that services provider raises error if service does."""
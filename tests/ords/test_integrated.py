@@ -3,6 +3,7 @@
 # pylint: disable=unused-argument
 """ELM Ordinance integration tests"""
 import time
+import random
 import logging
 import asyncio
 from pathlib import Path
@@ -56,6 +57,9 @@ async def patched_get_html(url, *args, **kwargs):
 async def test_openai_query(sample_openai_response, monkeypatch):
     """Test querying OpenAI while tracking limits and usage"""
 
+    # always wait the full (un-jittered) retry delay to keep timing exact
+    monkeypatch.setattr(random, "uniform", lambda low, high: high)
+
     start_time = None
     elapsed_times = []
 
@@ -8,6 +8,7 @@ from elm.ords.validation.content import (
     ValidationWithMemory,
     possibly_mentions_wind,
 )
+from elm.ords.validation import content as content_module
 
 
 @pytest.mark.asyncio
@@ -60,6 +61,37 @@ async def test_validation_with_mem():
     ]
 
 
+@pytest.mark.asyncio
+async def test_validation_with_mem_prefetch():
+    """Test prefetching validation results for several chunks"""
+
+    contents = []
+
+    class MockStructuredLLMCaller:
+        """Mock LLM caller for tests."""
+
+        async def call(self, sys_msg, content, *__, **___):
+            """Mock LLM call and record content"""
+            contents.append(content)
+            return {"test": True} if content == 1 else {}
+
+    text_chunks = list(range(4))
+    validator = ValidationWithMemory(MockStructuredLLMCaller(), text_chunks, 2)
+
+    await validator.prefetch(range(3), "Looking for key {key!r}", key="test")
+    assert sorted(contents) == [0, 1, 2]
+    assert validator.memory == [
+        {"test": False},
+        {"test": True},
+        {"test": False},
+        {},
+    ]
+
+    await validator.prefetch(range(3), "Looking for key {key!r}", key="test")
+    assert await validator.parse_from_ind(2, "{key}", key="test")
+    assert sorted(contents) == [0, 1, 2]
+
+
 @pytest.mark.parametrize(
     "text,truth",
     [
@@ -80,5 +112,42 @@ def test_possibly_mentions_wind(text, truth):
     assert possibly_mentions_wind(text) == truth
 
 
+@pytest.mark.parametrize(
+    "text,threshold,truth",
+    [
+        ("Wind SETBACKS", 0, True),
+        ("Wind SETBACKS", 2, False),
+        ("Wind SETBACKS (WECS systems)", 2, True),
+        ("Wind SETBACKS (WECS systems)", 3, False),
+        ("wind turbines and wind towers (WECS systems) setback", 4, True),
+        ("wind turbines and wind towers (WECS systems) setback", 5, False),
+        ("Window", 0, False),
+    ],
+)
+def test_possibly_mentions_wind_threshold(text, threshold, truth):
+    """Test `possibly_mentions_wind` function with various thresholds"""
+
+    out = possibly_mentions_wind(text, match_count_threshold=threshold)
+    assert out == truth
+
+
+def test_possibly_mentions_wind_cache():
+    """Test that long texts are cached per threshold"""
+
+    short_text = "Wind SETBACKS"
+    long_text = "\n".join(["Wind SETBACKS (WECS systems)"] * 50)
+    content_module._HEURISTIC_CACHE.clear()
+
+    assert possibly_mentions_wind(short_text)
+    assert not content_module._HEURISTIC_CACHE
+
+    assert possibly_mentions_wind(long_text, match_count_threshold=2)
+    assert not possibly_mentions_wind(long_text, match_count_threshold=3)
+    assert len(content_module._HEURISTIC_CACHE) == 2
+
+    assert possibly_mentions_wind(long_text, match_count_threshold=2)
+    assert len(content_module._HEURISTIC_CACHE) == 2
+
+
 if __name__ == "__main__":
     pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
@@ -22,6 +22,7 @@ from elm.ords.validation.location import (
     URLValidator,
     _validator_check_for_doc,
 )
+from elm.ords.utilities.exceptions import ELMOrdsValueError
 
 
 SHOULD_SKIP = os.getenv("AZURE_OPENAI_API_KEY") is None
@@ -282,5 +283,109 @@ async def test_doc_matches_county(
         assert out == truth
 
 
+@pytest.mark.asyncio
+async def test_validator_bind():
+    """Test that bound validator checks share formatting and cache"""
+
+    calls = []
+
+    class MockSLC:
+        """Mock structured LLM caller"""
+
+        async def call(self, sys_msg, content, usage_sub_label):
+            calls.append(sys_msg)
+            return {"correct_county": "decatur" in content}
+
+    validator = URLValidator(MockSLC())
+    check = validator.bind(county="Decatur", state="Indiana")
+    assert check is validator.bind(state="Indiana", county="Decatur")
+    assert check is not validator.bind(county="Decatur", state="Ohio")
+
+    assert not await check("")
+    assert not await check("http://decatur.gov")
+    assert not await validator.check(
+        "http://decatur.gov", county="Decatur", state="Indiana"
+    )
+    assert len(calls) == 1
+    assert "Decatur County" in calls[0]
+    assert "Indiana State" in calls[0]
+
+
+@pytest.mark.asyncio
+async def test_url_validator_check_many(batch_openai_client):
+    """Test `check_many` with and without the (mock) Batch API"""
+
+    service_calls = []
+
+    def _response(content):
+        passes = "decatur" in content or "fail" in content
+        return '{"correct_county": %s, "correct_state": true}' % str(
+            passes
+        ).lower()
+
+    class MockService:
+        """Mock LLM service"""
+
+        @classmethod
+        async def call(cls, usage_tracker, usage_sub_label, messages, **kw):
+            service_calls.append(messages[-1]["content"])
+            return _response(messages[-1]["content"])
+
+    def respond(body):
+        return _response(body["messages"][-1]["content"])
+
+    def fail(body):
+        return "fail" in body["messages"][-1]["content"]
+
+    slc = StructuredLLMCaller(
+        llm_service=MockService, model="gpt-4", temperature=0, timeout=30
+    )
+    urls = [
+        "http://decatur.gov",
+        "",
+        "http://test.gov",
+        "http://fail.gov",
+        "http://decatur.gov",
+    ]
+    expected = [True, False, False, True, True]
+
+    with pytest.raises(ELMOrdsValueError):
+        URLValidator(slc, batch_mode=True)
+
+    validator = URLValidator(slc)
+    out = await validator.check_many(urls, county="Decatur", state="Indiana")
+    assert out == expected
+    assert sorted(service_calls) == sorted(set(urls) - {""})
+
+    service_calls.clear()
+    client = batch_openai_client(respond, fail=fail)
+    validator = URLValidator(slc, batch_mode=True, batch_client=client)
+    out = await validator.check_many(urls, county="Decatur", state="Indiana")
+    assert out == expected
+    assert len(client.uploaded) == 1
+    bodies = [r["body"] for r in client.uploaded[0]]
+    assert [b["messages"][-1]["content"] for b in bodies] == [
+        "http://decatur.gov",
+        "http://test.gov",
+        "http://fail.gov",
+    ]
+    assert all(b["model"] == "gpt-4" for b in bodies)
+    assert all("timeout" not in b for b in bodies)
+    assert all(
+        "JSON format" in b["messages"][0]["content"] for b in bodies
+    )
+    assert service_calls == ["http://fail.gov"], "Failed items run singly"
+
+    out = await validator.check_many(urls, county="Decatur", state="Indiana")
+    assert out == expected
+    assert len(client.uploaded) == 1, "Responses should be cached"
+    assert service_calls == ["http://fail.gov"]
+
+    assert await validator.check(
+        "http://test.gov", county="Decatur", state="Indiana"
+    ) is False
+    assert service_calls == ["http://fail.gov"]
+
+
 if __name__ == "__main__":
     pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
@@ -4,8 +4,10 @@ Test
 """
 import os
 import numpy as np
+import pytest
 from elm import TEST_DATA_DIR
 from elm.chunk import Chunker
+from elm.utilities.cache import LLMResponseCache
 
 
 os.environ["OPENAI_API_KEY"] = "dummy"
@@ -51,3 +53,20 @@ def test_by_tokens():
 
     assert len('\n\n'.join(chunks0.chunks)) == len('\n\n'.join(chunks1.chunks))
     assert len('\n\n'.join(chunks0.chunks)) == len('\n\n'.join(chunks2.chunks))
+
+
+def test_chunk_cache(tmp_path, monkeypatch):
+    """Test loading text chunks from the chunk cache"""
+    cache = LLMResponseCache(str(tmp_path / 'chunks.sqlite'))
+    chunks0 = Chunker(TEXT, tokens_per_chunk=100, chunk_cache=cache)
+    assert chunks0.chunks == Chunker(TEXT, tokens_per_chunk=100).chunks
+
+    def _no_chunking(self):
+        raise AssertionError('Text should not be re-chunked!')
+
+    monkeypatch.setattr(Chunker, 'chunk_text', _no_chunking)
+    chunks1 = Chunker(TEXT, tokens_per_chunk=100, chunk_cache=cache)
+    assert chunks1.chunks == chunks0.chunks
+
+    with pytest.raises(AssertionError):
+        Chunker(TEXT, tokens_per_chunk=200, chunk_cache=cache)
@@ -3,9 +3,17 @@
 Test
 """
 import os
+import json
+import time
+
+import pytest
+import requests
+
 from elm import TEST_DATA_DIR
 from elm.pdf import PDFtoTXT
+from elm.utilities.cache import LLMResponseCache
 import elm.pdf
+import elm.base
 
 os.environ["OPENAI_API_KEY"] = "dummy"
 
@@ -17,7 +25,7 @@ with open(FP_TXT, 'r', encoding='utf8') as f:
 
 
 class MockClass:
-    """Dummy class to mock requests.post"""
+    """Dummy class to mock requests.Session.post"""
 
     def __init__(self, **kwargs):
         self.kwargs = kwargs
@@ -32,7 +40,7 @@ class MockClass:
 
     @classmethod
     def call(cls, **kwargs):
-        """Mock for requests.post"""
+        """Mock for requests.Session.post"""
         return cls(**kwargs)
 
 
@@ -41,7 +49,7 @@ def test_pdf_txt_clean(mocker):
 
     Note that LLM-based text cleaning is mocked here and not actually tested.
     """
-    mocker.patch.object(elm.pdf.requests, "post", MockClass.call)
+    mocker.patch.object(requests.Session, "post", MockClass.call)
     pdf = PDFtoTXT(FP_PDF)
     pdf.clean_txt()
 
@@ -49,3 +57,127 @@ def test_pdf_txt_clean(mocker):
     ntotal = len(TEXT.split(' '))
 
     assert (missing / ntotal) < 0.1
+
+
+def test_pdf_load_without_pdfium(mocker):
+    """Test that PDF loading falls back to PyPDF2 without pypdfium2"""
+    pages = PDFtoTXT(FP_PDF, page_range=(0, 3)).raw_pages
+
+    mocker.patch.object(elm.pdf, "pdfium", None)
+    fallback_pages = PDFtoTXT(FP_PDF, page_range=(0, 3)).raw_pages
+
+    assert len(pages) == len(fallback_pages) == 3
+    assert 'GPT-4' in pages[0] and 'GPT-4' in fallback_pages[0]
+
+
+def test_pdf_load_parallel():
+    """Test that parallel page extraction matches serial extraction"""
+    serial = elm.pdf._load_pages(FP_PDF, slice(2, 9), max_workers=1)
+    parallel = elm.pdf._load_pages(FP_PDF, slice(2, 9), max_workers=2,
+                                   min_parallel_pages=1)
+    assert serial == parallel
+    assert len(serial[0]) == 7
+
+
+def test_pdf_load_serial(mocker):
+    """Test that max_workers=1 opens the PDF once without a process pool"""
+    pool = mocker.patch.object(elm.pdf, "ProcessPoolExecutor")
+    open_pdf = mocker.spy(elm.pdf, "_open_pdf")
+    mocker.patch.object(PDFtoTXT, "MIN_PARALLEL_LOAD_PAGES", 1)
+    pdf = PDFtoTXT(FP_PDF, page_range=(0, 3), max_workers=1)
+
+    assert len(pdf.raw_pages) == 3
+    assert open_pdf.call_count == 1
+    pool.assert_not_called()
+
+
+def test_pdf_txt_clean_cache(mocker, tmp_path):
+    """Test that cached page cleaning responses skip the API call."""
+    post = mocker.patch.object(requests.Session, "post",
+                               side_effect=MockClass.call)
+    pdf = PDFtoTXT(FP_PDF, page_range=(0, 3))
+    pdf.response_cache = LLMResponseCache(tmp_path / 'cache.db')
+    first = pdf.clean_txt()
+    assert post.call_count == 3
+
+    pdf = PDFtoTXT(FP_PDF, page_range=(0, 3))
+    pdf.response_cache = LLMResponseCache(tmp_path / 'cache.db')
+    assert pdf.clean_txt() == first
+    assert post.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_pdf_txt_clean_async_batched(mocker):
+    """Test cleaning several pages per (mocked) async API request."""
+    api_requests = []
+
+    async def call_api(url, headers, request_json):
+        api_requests.append(request_json)
+        content = request_json['messages'][1]['content']
+        if 'response_format' not in request_json:
+            return MockClass(json=request_json).json()
+        if sum('response_format' in r for r in api_requests) == 2:
+            return {'choices': [{'message': {'content': '{"pages": []}'}}]}
+        pages = content.split('"""')[1::2]
+        pages = [{'n': n, 'text': text} for n, text in enumerate(pages)]
+        content = json.dumps({'pages': pages})
+        return {'choices': [{'message': {'content': content}}]}
+
+    mocker.patch.object(elm.base.ApiBase, "call_api", call_api)
+    mocker.patch.object(elm.base.ApiBase, "count_tokens",
+                        lambda text, model: len(text) // 4)
+
+    pdf = PDFtoTXT(FP_PDF, page_range=(0, 7))
+    clean_pages = await pdf.clean_txt_async(batch_pages=3)
+
+    assert len(api_requests) == 2 + 3 + 1
+    assert [p.strip() for p in clean_pages] == [p.strip()
+                                                for p in pdf.raw_pages]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_pages", [0, -1])
+async def test_pdf_txt_clean_async_bad_batch_pages(batch_pages):
+    """Test that a non-positive number of pages per request raises"""
+    pdf = PDFtoTXT(FP_PDF, page_range=(0, 3))
+    with pytest.raises(ValueError, match="batch_pages must be at least 1"):
+        await pdf.clean_txt_async(batch_pages=batch_pages)
+
+
+def test_pdf_convert_to_txt_layouts(mocker):
+    """Test choosing between the (mocked) poppler layout outputs."""
+    outputs = {True: 'Column one    Column two\nMore text    More text\x0c',
+               False: 'Column one\nMore text\nColumn two\nMore text\x0c'}
+
+    def run(args, **kwargs):
+        stdout = outputs['-layout' in args].encode('utf-8')
+        return mocker.Mock(returncode=0, stdout=stdout)
+
+    run = mocker.patch.object(elm.pdf.subprocess, "run", side_effect=run)
+    pdf = PDFtoTXT(FP_PDF, page_range=(0, 1))
+    text = pdf.convert_to_txt()
+
+    assert run.call_count == 2
+    assert text == outputs[False].strip('\x0c')
+
+    outputs[True] = outputs[False]
+    outputs[False] = 'Wrong layout'
+    text = PDFtoTXT(FP_PDF, page_range=(0, 1)).convert_to_txt()
+    assert text == outputs[True].strip('\x0c')
+
+
+def test_pdf_convert_to_txt_waits_for_poppler(mocker):
+    """Test that the unused poppler run finishes before returning."""
+    finished = []
+
+    def run(args, **kwargs):
+        if '-layout' not in args:
+            time.sleep(0.2)
+        finished.append('-layout' in args)
+        return mocker.Mock(returncode=0, stdout=b'Single column text\x0c')
+
+    mocker.patch.object(elm.pdf.subprocess, "run", side_effect=run)
+    text = PDFtoTXT(FP_PDF, page_range=(0, 1)).convert_to_txt()
+
+    assert text == 'Single column text'
+    assert sorted(finished) == [False, True]
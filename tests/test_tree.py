@@ -56,3 +56,26 @@ def test_chunk_and_embed(mocker):
     assert 'next' in tree.history
     assert isinstance(tree['next']['response'], str)
     assert isinstance(response_dict['next'], str)
+
+
+def test_prompt_format_cache(mocker):
+    """Test that graph attribute changes from callbacks reach later prompts"""
+    mocker.patch.object(elm.tree.DecisionTree, "api", MockClass)
+
+    graph = nx.DiGraph(text='hello', name='Grant',
+                       api=ApiBase(model='gpt-35-turbo'))
+
+    # pylint: disable=unused-argument
+    def callback(response, tree, node_name):
+        tree.graph.graph['name'] = 'Mike'
+
+    graph.add_node('init', prompt='Say {text} to {name}', callback=callback)
+    graph.add_edge('init', 'next')
+    graph.add_node('next', prompt='Say {text} to {name}')
+
+    tree = DecisionTree(graph)
+    assert tree.run() == 'Say hello to Mike'
+    assert tree['init']['response'] == 'Say hello to Grant'
+
+    graph.graph['text'] = 'bye'
+    assert tree.run() == 'Say bye to Mike'
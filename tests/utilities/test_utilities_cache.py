@@ -0,0 +1,92 @@
+# -*- coding: utf-8 -*-
+"""Test ELM LLM response cache utilities"""
+import time
+from pathlib import Path
+
+import pytest
+
+from elm.utilities.cache import LLMResponseCache, SemanticResponseCache
+
+
+def test_llm_response_cache(tmp_path):
+    """Test storing and retrieving responses from the cache"""
+
+    cache = LLMResponseCache(tmp_path / "sub_dir" / "cache.db")
+    key = LLMResponseCache.make_key("gpt-4", "v1", "Some text")
+
+    assert key == LLMResponseCache.make_key("gpt-4", "v1", "Some text")
+    assert key != LLMResponseCache.make_key("gpt-4", "v2", "Some text")
+    assert key != LLMResponseCache.make_key("gpt-4v1", "", "Some text")
+
+    assert cache.get(key) is None
+    cache.put(key, "Response")
+    assert cache.get(key) == "Response"
+    assert LLMResponseCache(cache.fp).get(key) == "Response"
+
+    cache.put(key, "New response")
+    assert cache.get(key) == "New response"
+
+
+def test_llm_response_cache_expiration(tmp_path, monkeypatch):
+    """Test that expired cache entries are ignored and removed"""
+
+    cache = LLMResponseCache(tmp_path / "cache.db", ttl=10)
+    cache.put("a", "A")
+    cache.put("b", "B", ttl=100)
+    LLMResponseCache(cache.fp, ttl=None).put("c", "C")
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 50, raising=True)
+    assert cache.get("a") is None
+    assert cache.get("b") == "B"
+    assert cache.get("c") == "C"
+
+    cache.clear_expired()
+    monkeypatch.setattr(time, "time", lambda: now, raising=True)
+    assert cache.get("a") is None
+    assert cache.get("b") == "B"
+
+
+def test_semantic_response_cache(tmp_path):
+    """Test near-duplicate lookups and persistence of the semantic cache"""
+
+    fp = tmp_path / "semantic_cache"
+    cache = SemanticResponseCache(fp, threshold=0.95)
+    assert cache.get([1, 0, 0]) is None
+
+    cache.put([2, 0, 0], "x summary")
+    cache.put([0, 1, 0], "y summary")
+    assert len(cache) == 2
+    assert cache.get([1, 0.1, 0]) == "x summary"
+    assert cache.get([0.1, 1, 0]) == "y summary"
+    assert cache.get([1, 1, 0]) is None
+    assert cache.get([0, 0, 1]) is None
+
+    cache.save()
+    cache = SemanticResponseCache(fp, threshold=0.5)
+    assert len(cache) == 2
+    assert cache.get([1, 1, 0.1]) in {"x summary", "y summary"}
+    assert cache.get([0, 0, 1]) is None
+
+
+def test_semantic_response_cache_namespaces(tmp_path):
+    """Test that semantic cache lookups are partitioned by namespace"""
+
+    fp = tmp_path / "semantic_cache.npz"
+    cache = SemanticResponseCache(fp, threshold=0.95)
+    cache.put([1, 0, 0], "short summary", namespace="gpt-4 100 words")
+    cache.put([1, 0, 0], "long summary", namespace="gpt-4 500 words")
+
+    assert cache.get([1, 0, 0]) is None
+    assert cache.get([1, 0, 0], "gpt-4 100 words") == "short summary"
+    assert cache.get([1, 0, 0], "gpt-4 500 words") == "long summary"
+    assert cache.get([1, 0, 0], "gpt-3.5 100 words") is None
+
+    cache.save()
+    cache = SemanticResponseCache(fp, threshold=0.95)
+    assert cache.get([1, 0, 0], "gpt-4 100 words") == "short summary"
+    assert cache.get([1, 0, 0], "gpt-4 500 words") == "long summary"
+
+
+if __name__ == "__main__":
+    pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
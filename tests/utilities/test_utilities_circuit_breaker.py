@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""Test ELM circuit breaker utilities"""
+import time
+from pathlib import Path
+
+import pytest
+
+from elm.utilities.circuit_breaker import CircuitBreaker
+from elm.utilities.retry import retry_with_exponential_backoff
+from elm.exceptions import ELMRuntimeError
+
+
+def test_circuit_breaker_states(monkeypatch):
+    """Test circuit breaker state transitions"""
+
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0], raising=True)
+
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=10)
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow()
+
+    now[0] += 10
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    now[0] += 10
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.failures == 0
+    assert breaker.allow()
+
+
+def test_retry_with_circuit_breaker():
+    """Test that retries fail fast once the circuit breaker opens"""
+
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60)
+    calls = []
+
+    @retry_with_exponential_backoff(
+        base_delay=0.01,
+        exponential_base=1,
+        jitter=False,
+        max_retries=5,
+        errors=(ValueError,),
+        circuit_breaker=breaker,
+    )
+    def failing_function():
+        calls.append(1)
+        raise ValueError("I'm broken")
+
+    with pytest.raises(ELMRuntimeError, match="Circuit breaker is open"):
+        failing_function()
+    assert len(calls) == 2
+
+    with pytest.raises(ELMRuntimeError, match="Circuit breaker is open"):
+        failing_function()
+    assert len(calls) == 2
+
+
+if __name__ == "__main__":
+    pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
@@ -113,6 +113,11 @@ def test_format_html_tables():
     bad_table_text = SAMPLE_TABLE_TEXT + "\nBad table:\n<table></table>"
     assert format_html_tables(bad_table_text) == bad_table_text
 
+    two_tables = SAMPLE_TABLE_TEXT + "\n" + SAMPLE_TABLE_TEXT
+    assert format_html_tables(two_tables) == (
+        EXPECTED_TABLE_OUT + "\n" + EXPECTED_TABLE_OUT
+    )
+
 
 def test_clean_headers():
     """Test the `clean_headers` function (basic execution)"""
@@ -125,6 +130,9 @@ def test_clean_headers():
     assert "Page" not in out
     assert "pp." not in out
 
+    short_doc = PAGES_WITH_HEADERS_AND_FOOTERS[1:3]
+    assert clean_headers(list(short_doc)) == short_doc
+
 
 def test_replace_common_pdf_conversion_chars():
     """Test the `replace_common_pdf_conversion_chars` function (basic exec.)"""
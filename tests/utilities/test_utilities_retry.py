@@ -2,6 +2,7 @@
 """Test ELM Ordinance retry utilities"""
 import time
 import random
+import asyncio
 from pathlib import Path
 
 import pytest
@@ -13,11 +14,11 @@ from elm.utilities.retry import (
 from elm.exceptions import ELMRuntimeError
 
 
-@pytest.mark.parametrize("jitter, bounds", [(False, (2, 3)), (True, (4, 5))])
+@pytest.mark.parametrize("jitter, bounds", [(False, (2, 3)), (True, (1, 2))])
 def test_sync_retry(jitter, bounds, monkeypatch):
     """Test the `retry_with_exponential_backoff` decorator"""
 
-    monkeypatch.setattr(random, "random", lambda: 1, raising=True)
+    monkeypatch.setattr(random, "random", lambda: 0, raising=True)
 
     @retry_with_exponential_backoff(
         exponential_base=2, max_retries=1, jitter=jitter, errors=(ValueError,)
@@ -33,11 +34,11 @@ def test_sync_retry(jitter, bounds, monkeypatch):
 
 
 @pytest.mark.asyncio
-@pytest.mark.parametrize("jitter, bounds", [(False, (2, 3)), (True, (4, 5))])
+@pytest.mark.parametrize("jitter, bounds", [(False, (2, 3)), (True, (1, 2))])
 async def test_async_retry(jitter, bounds, monkeypatch):
     """Test the `async_retry_with_exponential_backoff` decorator"""
 
-    monkeypatch.setattr(random, "random", lambda: 1, raising=True)
+    monkeypatch.setattr(random, "random", lambda: 0, raising=True)
 
     @async_retry_with_exponential_backoff(
         exponential_base=2, max_retries=1, jitter=jitter, errors=(ValueError,)
@@ -52,5 +53,73 @@ async def test_async_retry(jitter, bounds, monkeypatch):
     assert bounds[0] <= elapsed_time < bounds[1]
 
 
+def test_retry_max_delay():
+    """Test that the retry delay is capped by `max_delay`"""
+
+    @retry_with_exponential_backoff(
+        exponential_base=100,
+        max_retries=1,
+        jitter=False,
+        errors=(ValueError,),
+        max_delay=0.5,
+    )
+    def failing_function():
+        raise ValueError("I'm broken")
+
+    start_time = time.monotonic()
+    with pytest.raises(ELMRuntimeError):
+        failing_function()
+    elapsed_time = time.monotonic() - start_time
+    assert 0.5 <= elapsed_time < 1
+
+
+def test_retry_max_timeout():
+    """Test that the `timeout` kwarg is doubled up to `max_timeout`"""
+    timeouts = []
+
+    @retry_with_exponential_backoff(
+        base_delay=0,
+        max_retries=3,
+        jitter=False,
+        errors=(ValueError,),
+        max_timeout=5,
+    )
+    def failing_function(timeout):
+        timeouts.append(timeout)
+        raise ValueError("I'm broken")
+
+    kwargs = {"timeout": 2}
+    with pytest.raises(ELMRuntimeError):
+        failing_function(**kwargs)
+
+    assert timeouts == [2, 4, 5, 5]
+    assert kwargs == {"timeout": 2}
+
+
+@pytest.mark.asyncio
+async def test_async_retry_does_not_block():
+    """Test that async retries do not block the event loop while waiting"""
+
+    @async_retry_with_exponential_backoff(
+        base_delay=0.1,
+        exponential_base=2,
+        max_retries=2,
+        jitter=False,
+        errors=(ValueError,),
+    )
+    async def failing_function():
+        raise ValueError("I'm broken")
+
+    start_time = time.monotonic()
+    results = await asyncio.gather(
+        *(failing_function() for _ in range(50)), return_exceptions=True
+    )
+    elapsed_time = time.monotonic() - start_time
+
+    assert all(isinstance(r, ELMRuntimeError) for r in results)
+    # each call waits 0.2 + 0.4 seconds; a blocking sleep would take 30 s
+    assert elapsed_time < 2
+
+
 if __name__ == "__main__":
     pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
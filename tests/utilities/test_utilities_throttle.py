@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Test ELM throttling utilities"""
+import time
+from pathlib import Path
+
+import pytest
+
+from elm.utilities.throttle import AsyncTokenBucket, AdaptiveTokenBucket
+
+
+def test_token_bucket(monkeypatch):
+    """Test token bucket refill and acquisition logic"""
+
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0], raising=True)
+
+    bucket = AsyncTokenBucket(rate=10, capacity=100)
+    assert bucket.tokens == 100
+    assert bucket.try_acquire(60)
+    assert not bucket.try_acquire(60)
+    assert bucket.tokens == 40
+    assert bucket.wait_time(60) == pytest.approx(2)
+
+    now[0] += 1
+    assert bucket.tokens == pytest.approx(50)
+    assert bucket.wait_time(60) == pytest.approx(1)
+
+    now[0] += 100
+    assert bucket.tokens == 100
+    assert bucket.wait_time(60) == 0
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_acquire():
+    """Test waiting on the token bucket"""
+
+    bucket = AsyncTokenBucket(rate=100, capacity=10)
+    await bucket.acquire(10)
+
+    start_time = time.monotonic()
+    await bucket.acquire(10)
+    assert time.monotonic() - start_time >= 0.09
+
+    with pytest.raises(ValueError):
+        await bucket.acquire(11)
+
+
+def test_adaptive_token_bucket(monkeypatch):
+    """Test AIMD rate adaptation of the adaptive token bucket"""
+
+    now = [100.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0], raising=True)
+
+    bucket = AdaptiveTokenBucket(rate=10, capacity=100, increase=1)
+    assert bucket.min_rate == 1
+    assert bucket.try_acquire(100)
+
+    bucket.on_failure()
+    assert bucket.rate == 5
+    now[0] += 2
+    assert bucket.tokens == pytest.approx(10)
+
+    for _ in range(10):
+        bucket.on_failure()
+    assert bucket.rate == 1
+
+    bucket.on_success()
+    assert bucket.rate == 2
+    for _ in range(20):
+        bucket.on_success()
+    assert bucket.rate == 10
+
+
+if __name__ == "__main__":
+    pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""Test ELM validation utilities"""
+from pathlib import Path
+
+import pytest
+
+from elm.utilities.validation import validate_azure_api_params
+
+
+AZURE_ENV_VARS = [
+    "AZURE_OPENAI_API_KEY",
+    "AZURE_OPENAI_VERSION",
+    "AZURE_OPENAI_ENDPOINT",
+]
+
+
+def test_validate_azure_api_params(monkeypatch):
+    """Test validating Azure API params from inputs and environment"""
+    for var in AZURE_ENV_VARS:
+        monkeypatch.delenv(var, raising=False)
+
+    assert validate_azure_api_params("key", "v1", "url") == (
+        "key",
+        "v1",
+        "url",
+    )
+
+    monkeypatch.setenv("AZURE_OPENAI_API_KEY", "env_key")
+    monkeypatch.setenv("AZURE_OPENAI_VERSION", "env_v1")
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "env_url")
+    assert validate_azure_api_params() == ("env_key", "env_v1", "env_url")
+    assert validate_azure_api_params(azure_api_key="key")[0] == "key"
+
+
+@pytest.mark.parametrize("missing", AZURE_ENV_VARS)
+def test_validate_azure_api_params_missing(missing, monkeypatch):
+    """Test that a missing Azure API param raises an error"""
+    for var in AZURE_ENV_VARS:
+        monkeypatch.setenv(var, "value")
+    monkeypatch.delenv(missing)
+
+    with pytest.raises(ValueError, match=missing):
+        validate_azure_api_params()
+
+
+if __name__ == "__main__":
+    pytest.main(["-q", "--show-capture=all", Path(__file__), "-rapP"])